@@ -285,40 +285,52 @@ async def periodic_health_check(ctx: Context):
     """주기적 상태 체크"""
     logger.info(f"💓 Health check - Searches: {search_count}, Uptime: {datetime.now() - start_time}")
 
-# HTTP 상태 확인을 위한 간단한 엔드포인트 추가
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+def create_status_app():
+    """HTTP 상태 확인용 FastAPI 앱 생성 (STATUS_PORT 설정 시에만 호출)
 
-# FastAPI 인스턴스 생성 (uAgent와 별도)
-status_app = FastAPI(title="WRLD Relief Disaster Agent Status")
+    FastAPI/Starlette import는 콜드 스타트를 수백 ms 늦추므로
+    실제로 상태 서버를 띄울 때까지 지연시킨다.
+    """
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse
 
-@status_app.get("/")
-async def agent_status():
-    """에이전트 상태 확인 엔드포인트"""
-    uptime = datetime.now() - start_time
-    return JSONResponse({
-        "agent_name": "WRLD Relief Disaster Agent",
-        "status": "online",
-        "address": str(agent.address),
-        "port": 8001,
-        "search_count": search_count,
-        "uptime": f"{uptime.days}d {uptime.seconds//3600}h {(uptime.seconds//60)%60}m",
-        "ai_engine": "initialized" if search_engine else "not_initialized",
-        "endpoints": agent._endpoints,
-        "message": "Agent is running and ready for disaster monitoring!",
-        "protocols": ["DisasterQuery", "DisasterResults", "AgentStatus"],
-        "last_health_check": datetime.now().isoformat()
-    })
+    # FastAPI 인스턴스 생성 (uAgent와 별도)
+    status_app = FastAPI(title="WRLD Relief Disaster Agent Status")
+
+    @status_app.get("/")
+    async def agent_status():
+        """에이전트 상태 확인 엔드포인트"""
+        uptime = datetime.now() - start_time
+        return JSONResponse({
+            "agent_name": "WRLD Relief Disaster Agent",
+            "status": "online",
+            "address": str(agent.address),
+            "port": 8001,
+            "search_count": search_count,
+            "uptime": f"{uptime.days}d {uptime.seconds//3600}h {(uptime.seconds//60)%60}m",
+            "ai_engine": "initialized" if search_engine else "not_initialized",
+            "endpoints": agent._endpoints,
+            "message": "Agent is running and ready for disaster monitoring!",
+            "protocols": ["DisasterQuery", "DisasterResults", "AgentStatus"],
+            "last_health_check": datetime.now().isoformat()
+        })
+
+    @status_app.get("/health")
+    async def health_check():
+        """간단한 헬스 체크"""
+        return {"status": "healthy", "agent": "disaster_monitor", "timestamp": datetime.now().isoformat()}
 
-@status_app.get("/health")
-async def health_check():
-    """간단한 헬스 체크"""
-    return {"status": "healthy", "agent": "disaster_monitor", "timestamp": datetime.now().isoformat()}
+    return status_app
 
 if __name__ == "__main__":
     logger.info("🌍 Starting WRLD Relief Disaster Monitoring Agent...")
     logger.info("🎯 Ready to monitor global disasters and conflicts!")
     logger.info("🔗 Connect via ASI:One or send DisasterQuery messages")
-    
+
+    # 상태 서버가 필요할 때만 FastAPI 로드
+    if os.getenv("STATUS_PORT"):
+        status_app = create_status_app()
+        logger.info(f"📡 Status app created (serve separately on port {os.getenv('STATUS_PORT')})")
+
     # 에이전트 실행
     agent.run()
@@ -5,12 +5,26 @@ Real-time disaster monitoring with natural language chat support
 """
 
 from uagents import Agent, Context, Model
+from array import array
+from operator import itemgetter
 import aiohttp
+import heapq
 import json
 import asyncio
 from typing import List, Dict, Any
 from datetime import datetime
+from functools import lru_cache
+import os
+import pickle
 import re
+import time
+
+# orjson이 있으면 더 빠른 JSON 파싱 사용 (없으면 stdlib json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # ============================================================================
 # 메시지 모델 정의
@@ -81,6 +95,9 @@ agent = Agent(
 
 disaster_cache = []
 last_update = 0
+last_update_mono = 0.0  # TTL 비교용 단조 시계 (벽시계 점프 영향 없음)
+AGENT_ADDR = ""  # startup에서 1회 계산 (주소 파생 비용 반복 방지)
+_status_cache = (0.0, "")  # (단조 시각, 텍스트) 5초 TTL 상태 응답 캐시
 search_count = 0
 start_time = datetime.now()
 
@@ -88,58 +105,93 @@ start_time = datetime.now()
 # 데이터 수집 함수들
 # ============================================================================
 
+# 공유 HTTP 세션 (요청마다 세션/커넥션을 새로 만들지 않고 keep-alive 재사용)
+_HTTP_SESSION: aiohttp.ClientSession = None
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """공유 ClientSession 반환 (최초 호출 시 생성)"""
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None or _HTTP_SESSION.closed:
+        _HTTP_SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _HTTP_SESSION
+
+
+# USGS 조건부 GET용 ETag와 마지막 파싱 결과 (304면 파싱 생략)
+_usgs_etag = None
+_usgs_cached_quakes: List[Dict] = []
+
+
 async def fetch_usgs_earthquakes(ctx: Context) -> List[Dict]:
-    """USGS 지진 데이터 실시간 수집"""
+    """USGS 지진 데이터 실시간 수집 (ETag 조건부 GET)"""
+    global _usgs_etag, _usgs_cached_quakes
     disasters = []
-    
+
     try:
-        async with aiohttp.ClientSession() as session:
-            # 주요 지진 데이터
-            url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/significant_week.geojson"
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    for feature in data.get('features', [])[:15]:  # 최대 15개
-                        props = feature.get('properties', {})
-                        coords = feature.get('geometry', {}).get('coordinates', [0, 0, 0])
-                        
-                        # 심각도 계산
-                        magnitude = props.get('mag', 0)
-                        if magnitude >= 7.0:
-                            severity = 'CRITICAL'
-                        elif magnitude >= 6.0:
-                            severity = 'HIGH'
-                        elif magnitude >= 5.0:
-                            severity = 'MEDIUM'
-                        else:
-                            severity = 'LOW'
-                        
-                        disaster = {
-                            'id': f"usgs_{props.get('ids', f'eq_{int(datetime.now().timestamp())}')}",
-                            'title': props.get('title', 'Earthquake'),
-                            'description': f"Magnitude {magnitude} earthquake. {props.get('type', 'earthquake').title()} event.",
-                            'location': props.get('place', 'Unknown location'),
-                            'severity': severity,
-                            'category': 'EARTHQUAKE',
-                            'timestamp': props.get('time', 0) // 1000,  # ms to seconds
-                            'source': 'USGS',
-                            'confidence': 0.95,
-                            'affected_people': estimate_affected_people(magnitude),
-                            'coordinates': {"lat": coords[1] if len(coords) > 1 else 0.0, "lng": coords[0] if len(coords) > 0 else 0.0}
-                        }
-                        disasters.append(disaster)
-                        
-        ctx.logger.info(f"📊 Fetched {len(disasters)} earthquakes from USGS")
-        
+        session = _get_session()
+
+        # 주요 지진 데이터
+        url = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/significant_week.geojson"
+        headers = {"If-None-Match": _usgs_etag} if _usgs_etag else {}
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                # 피드 변경 없음: 지난 파싱 결과 재사용
+                ctx.logger.info(f"📊 USGS feed unchanged (304), reusing {len(_usgs_cached_quakes)} earthquakes")
+                return _usgs_cached_quakes
+            if response.status == 200:
+                data = _json_loads(await response.read())
+
+                # 전체 피처 목록은 버리고 상위 15개만 바로 슬라이스
+                for feature in data.get('features', [])[:15]:
+                    props = feature.get('properties', {})
+                    coords = feature.get('geometry', {}).get('coordinates', [0, 0, 0])
+
+                    # 심각도 계산
+                    magnitude = props.get('mag', 0)
+                    if magnitude >= 7.0:
+                        severity = 'CRITICAL'
+                    elif magnitude >= 6.0:
+                        severity = 'HIGH'
+                    elif magnitude >= 5.0:
+                        severity = 'MEDIUM'
+                    else:
+                        severity = 'LOW'
+
+                    disaster = {
+                        'id': f"usgs_{props.get('ids', f'eq_{int(time.time())}')}",
+                        'title': props.get('title', 'Earthquake'),
+                        'description': f"Magnitude {magnitude} earthquake. {props.get('type', 'earthquake').title()} event.",
+                        'location': props.get('place', 'Unknown location'),
+                        'severity': severity,
+                        'category': 'EARTHQUAKE',
+                        'timestamp': props.get('time', 0) // 1000,  # ms to seconds
+                        'source': 'USGS',
+                        'confidence': 0.95,
+                        'affected_people': estimate_affected_people(magnitude),
+                        'coordinates': {"lat": coords[1] if len(coords) > 1 else 0.0, "lng": coords[0] if len(coords) > 0 else 0.0}
+                    }
+                    disasters.append(disaster)
+
+                # 캐시와 ETag는 파싱까지 성공한 200 응답에서만 갱신 —
+                # 오류 응답에서 갱신하면 이후 304가 빈 결과를 고정시킨다
+                _usgs_etag = response.headers.get("ETag")
+                _usgs_cached_quakes = disasters
+                ctx.logger.info(f"📊 Fetched {len(disasters)} earthquakes from USGS")
+            else:
+                ctx.logger.warning(f"⚠️ USGS HTTP {response.status}, keeping previous cache")
+                return _usgs_cached_quakes
+
     except Exception as e:
         ctx.logger.error(f"❌ USGS fetch error: {e}")
-    
+
     return disasters
 
 async def fetch_simulated_disasters(ctx: Context) -> List[Dict]:
     """다양한 재해 시뮬레이션 데이터"""
-    current_time = int(datetime.now().timestamp())
+    current_time = int(time.time())
     
     simulated_disasters = [
         {
@@ -227,135 +279,272 @@ def estimate_affected_people(magnitude: float) -> int:
 # 검색 엔진
 # ============================================================================
 
+# 토큰화 정규식 (1회 컴파일, \w는 한글도 포함)
+_TOKEN_RE = re.compile(r"[\w]+", re.UNICODE)
+
+# 한국어-영어 키워드 매핑 (frozenset: 토큰 집합에 합집합으로 바로 병합)
+korean_mappings = {
+    '지진': frozenset(('earthquake', 'seismic')),
+    '홍수': frozenset(('flood', 'flooding')),
+    '산불': frozenset(('fire', 'wildfire')),
+    '태풍': frozenset(('hurricane', 'typhoon', 'cyclone')),
+    '화산': frozenset(('volcano', 'volcanic')),
+    '분쟁': frozenset(('war', 'conflict', 'attack')),
+    '재해': frozenset(('disaster', 'emergency')),
+    '재난': frozenset(('disaster', 'catastrophe')),
+    '일본': frozenset(('japan', 'japanese')),
+    '중국': frozenset(('china', 'chinese')),
+    '미국': frozenset(('usa', 'america', 'united', 'states')),
+    '인도네시아': frozenset(('indonesia', 'indonesian')),
+    '필리핀': frozenset(('philippines', 'philippine')),
+    '방글라데시': frozenset(('bangladesh',)),
+    '최근': frozenset(('recent', 'latest')),
+    '오늘': frozenset(('today', 'current')),
+    '어제': frozenset(('yesterday',)),
+    '심각한': frozenset(('severe', 'critical', 'major')),
+    '큰': frozenset(('large', 'big', 'major'))
+}
+
+# 한국어 키워드 19개를 1회 스캔으로 찾는 교대 패턴 (긴 키워드 우선)
+KOREAN_RE = re.compile('|'.join(
+    map(re.escape, sorted(korean_mappings, key=len, reverse=True))
+))
+
+# 카테고리별 특별 점수
+category_bonuses = {
+    'earthquake': 'EARTHQUAKE',
+    'seismic': 'EARTHQUAKE',
+    'flood': 'FLOOD',
+    'flooding': 'FLOOD',
+    'fire': 'WILDFIRE',
+    'wildfire': 'WILDFIRE',
+    'hurricane': 'HURRICANE',
+    'typhoon': 'HURRICANE',
+    'cyclone': 'HURRICANE',
+    'volcano': 'VOLCANO',
+    'volcanic': 'VOLCANO',
+    'conflict': 'CONFLICT',
+    'war': 'CONFLICT',
+    'attack': 'CONFLICT'
+}
+
+# 지역별 특별 점수
+location_bonuses = {
+    'japan': ['japan', 'japanese'],
+    'china': ['china', 'chinese'],
+    'usa': ['united states', 'america', 'california', 'texas'],
+    'indonesia': ['indonesia', 'java'],
+    'philippines': ['philippines', 'visayas'],
+    'bangladesh': ['bangladesh', 'sylhet']
+}
+
+# 심각도 기반 점수
+severity_bonuses = {
+    'CRITICAL': 4,
+    'HIGH': 3,
+    'MEDIUM': 2,
+    'LOW': 1
+}
+
+# 보너스 트리거 단어들 (O(1) 해시 집합 교집합용)
+SEVERITY_TRIGGER_WORDS = frozenset(('severe', 'critical', 'major', 'serious', '심각한', '큰'))
+RECENCY_WORDS = frozenset(('recent', 'latest', 'today', 'current', '최근', '오늘'))
+
+# 역색인 대상 필드(소문자 캐시)와 가중치
+_INDEX_FIELDS = (('_title_lc', 5), ('_desc_lc', 3), ('_loc_lc', 4), ('_cat_lc', 2))
+
+# 토큰 → (int32 인덱스 배열, int8 가중치 배열) 역색인 (refresh 시 구축)
+INDEX: Dict[str, tuple] = {}
+
+# 카테고리 문자열 → 정수 코드 (SoA 컬럼 인코딩용)
+_CATEGORY_CODES = {
+    'EARTHQUAKE': 0, 'FLOOD': 1, 'WILDFIRE': 2,
+    'HURRICANE': 3, 'VOLCANO': 4, 'CONFLICT': 5
+}
+
+# refresh 시 1회 구축되는 정수 인코딩 SoA 컬럼 (int8/int64 typed array)
+_score_cat_codes = array('b')
+_score_sev_bonus = array('b')
+_score_ts = array('q')
+
+# 쿼리 트리거 단어 → 비트 플래그 (쿼리 토큰 1회 순회로 모든 보너스 활성화 판정)
+# 비트 0~5: 카테고리 코드, 6~11: 지역, 12: 심각도, 13: 최근
+_REGION_BITS = {
+    'japan': 6, 'china': 7, 'usa': 8,
+    'indonesia': 9, 'philippines': 10, 'bangladesh': 11
+}
+_FLAG_SEVERE = 1 << 12
+_FLAG_RECENT = 1 << 13
+
+QUERY_FLAG_TABLE: Dict[str, int] = {}
+for _kw, _cat in category_bonuses.items():
+    QUERY_FLAG_TABLE[_kw] = QUERY_FLAG_TABLE.get(_kw, 0) | (1 << _CATEGORY_CODES[_cat])
+for _region, _bit in _REGION_BITS.items():
+    QUERY_FLAG_TABLE[_region] = QUERY_FLAG_TABLE.get(_region, 0) | (1 << _bit)
+for _word in SEVERITY_TRIGGER_WORDS:
+    QUERY_FLAG_TABLE[_word] = QUERY_FLAG_TABLE.get(_word, 0) | _FLAG_SEVERE
+for _word in RECENCY_WORDS:
+    QUERY_FLAG_TABLE[_word] = QUERY_FLAG_TABLE.get(_word, 0) | _FLAG_RECENT
+del _kw, _cat, _region, _bit, _word
+
+
+def build_score_tables():
+    """disaster_cache를 정수 인코딩 SoA 컬럼으로 변환 (refresh마다 1회)
+
+    쿼리 시점의 dict.get + 문자열 비교를 제거하고 보너스 계산을
+    정수 배열 인덱싱으로 바꾼다.
+    """
+    global _score_cat_codes, _score_sev_bonus, _score_ts
+
+    cat_codes = array('b')
+    sev_bonus = array('b')
+    ts = array('q')
+
+    for disaster in disaster_cache:
+        cat_codes.append(_CATEGORY_CODES.get(disaster.get('category', ''), -1))
+        sev_bonus.append(severity_bonuses.get(disaster.get('severity', 'LOW'), 0))
+        ts.append(disaster.get('timestamp', 0))
+
+    _score_cat_codes = cat_codes
+    _score_sev_bonus = sev_bonus
+    _score_ts = ts
+
+
+def _rebuild_index():
+    """disaster_cache 전체를 훑어 역색인을 재구축 (refresh마다 1회)
+
+    쿼리 시 전체 캐시를 재스캔하는 대신, 쿼리 토큰의 포스팅만 순회하도록
+    토큰 → (int32 인덱스 배열, int8 가중치 배열) 평행 컬럼을 만든다.
+    튜플 리스트 대비 메모리가 작고 순회 시 객체 생성이 없다.
+    """
+    global INDEX
+
+    postings = {}
+    for idx, disaster in enumerate(disaster_cache):
+        for field, weight in _INDEX_FIELDS:
+            for token in _TOKEN_RE.findall(disaster.get(field, '')):
+                postings.setdefault(token, []).append((idx, weight))
+
+    INDEX = {
+        token: (array('i', (p[0] for p in pairs)), array('b', (p[1] for p in pairs)))
+        for token, pairs in postings.items()
+    }
+
+
+def normalize_disasters(disasters: List[Dict]) -> List[Dict]:
+    """수집 시점에 소문자 필드를 1회 캐시 (쿼리마다 lower() 재실행 방지)"""
+    for disaster in disasters:
+        disaster['_title_lc'] = disaster.get('title', '').lower()
+        disaster['_desc_lc'] = disaster.get('description', '').lower()
+        disaster['_loc_lc'] = disaster.get('location', '').lower()
+        disaster['_cat_lc'] = disaster.get('category', '').lower()
+    return disasters
+
+
 def search_disasters_by_query(query: str, max_results: int = 10) -> List[Dict]:
-    """고급 재해 검색 엔진"""
+    """고급 재해 검색 엔진 (역색인 기반)"""
     query_lower = query.lower()
-    matched_disasters = []
-    
-    # 한국어-영어 키워드 매핑
-    korean_mappings = {
-        '지진': ['earthquake', 'seismic'],
-        '홍수': ['flood', 'flooding'],
-        '산불': ['fire', 'wildfire'],
-        '태풍': ['hurricane', 'typhoon', 'cyclone'],
-        '화산': ['volcano', 'volcanic'],
-        '분쟁': ['war', 'conflict', 'attack'],
-        '재해': ['disaster', 'emergency'],
-        '재난': ['disaster', 'catastrophe'],
-        '일본': ['japan', 'japanese'],
-        '중국': ['china', 'chinese'],
-        '미국': ['usa', 'america', 'united states'],
-        '인도네시아': ['indonesia', 'indonesian'],
-        '필리핀': ['philippines', 'philippine'],
-        '방글라데시': ['bangladesh'],
-        '최근': ['recent', 'latest'],
-        '오늘': ['today', 'current'],
-        '어제': ['yesterday'],
-        '심각한': ['severe', 'critical', 'major'],
-        '큰': ['large', 'big', 'major']
-    }
-    
-    # 쿼리 확장 (한국어 → 영어)
-    expanded_query = query_lower
-    for korean, english_words in korean_mappings.items():
-        if korean in query_lower:
-            expanded_query += ' ' + ' '.join(english_words)
-    
-    query_words = expanded_query.split()
-    
-    for disaster in disaster_cache:
-        score = 0
-        
-        # 텍스트 필드들
-        title = disaster.get('title', '').lower()
-        description = disaster.get('description', '').lower()
-        location = disaster.get('location', '').lower()
-        category = disaster.get('category', '').lower()
-        
-        # 기본 키워드 매칭
-        for word in query_words:
-            if len(word) < 2:  # 너무 짧은 단어 제외
-                continue
-                
-            if word in title:
-                score += 5  # 제목에서 발견시 높은 점수
-            if word in description:
-                score += 3  # 설명에서 발견시 중간 점수
-            if word in location:
-                score += 4  # 위치에서 발견시 높은 점수
-            if word in category:
-                score += 2  # 카테고리에서 발견시 낮은 점수
-        
-        # 카테고리별 특별 점수
-        category_bonuses = {
-            'earthquake': 'EARTHQUAKE',
-            'seismic': 'EARTHQUAKE',
-            'flood': 'FLOOD',
-            'flooding': 'FLOOD',
-            'fire': 'WILDFIRE',
-            'wildfire': 'WILDFIRE',
-            'hurricane': 'HURRICANE',
-            'typhoon': 'HURRICANE',
-            'cyclone': 'HURRICANE',
-            'volcano': 'VOLCANO',
-            'volcanic': 'VOLCANO',
-            'conflict': 'CONFLICT',
-            'war': 'CONFLICT',
-            'attack': 'CONFLICT'
-        }
-        
-        for keyword, cat in category_bonuses.items():
-            if keyword in expanded_query and disaster.get('category') == cat:
-                score += 10
-        
+
+    # last_update를 캐시 버전으로 넘겨 refresh 이후 자동 무효화
+    top = _search_cached(query_lower, max_results, last_update)
+
+    # 점수는 정렬에만 쓰이므로 레코드 복사/변형 없이 캐시 dict를 그대로 반환
+    return [disaster_cache[idx] for idx, _score in top]
+
+
+@lru_cache(maxsize=512)
+def _search_cached(query_lower: str, max_results: int, cache_version: int) -> tuple:
+    """순수 검색 코어: (캐시 인덱스, 점수) 튜플 반환 (반복 쿼리는 LRU 히트)
+
+    cache_version(=last_update)이 키에 포함되므로 데이터 refresh 시
+    이전 항목은 자연히 미스가 된다.
+    """
+    # 쿼리 확장 (한국어 → 영어): 중간 문자열 없이 토큰 집합에 바로 병합
+    qset = {word for word in _TOKEN_RE.findall(query_lower) if len(word) >= 2}
+    for korean in KOREAN_RE.findall(query_lower):
+        qset |= korean_mappings[korean]
+
+    # 보너스 활성화 판정: 쿼리 토큰 1회 순회로 비트마스크 구성
+    qflags = 0
+    for word in qset:
+        qflags |= QUERY_FLAG_TABLE.get(word, 0)
+
+    active_location_keywords = [
+        loc_keyword
+        for region, bit in _REGION_BITS.items() if qflags & (1 << bit)
+        for loc_keyword in location_bonuses[region]
+    ]
+    wants_severity = qflags & _FLAG_SEVERE
+    wants_recent = qflags & _FLAG_RECENT
+    current_time = int(time.time())
+
+    # SoA 컬럼이 캐시와 어긋나 있으면 재구축 (방어적)
+    if len(_score_cat_codes) != len(disaster_cache):
+        build_score_tables()
+        _rebuild_index()
+
+    # 기본 키워드 점수: 쿼리 토큰의 포스팅 컬럼만 순회 (전체 캐시 스캔 없음)
+    scores: Dict[int, int] = {}
+    for word in qset:
+        posting = INDEX.get(word)
+        if posting is None:
+            continue
+        indices, weights = posting
+        for idx, weight in zip(indices, weights):
+            scores[idx] = scores.get(idx, 0) + weight
+
+    # 포스팅 미스 시 폴백 1: 부분 토큰('quake' 등)은 역색인에 없으므로
+    # 소문자 필드 캐시에 대한 부분 문자열 스캔으로 기본 점수를 복원
+    # (포스팅 히트가 있는 일반 쿼리는 이 경로를 타지 않음)
+    if not scores and qset:
+        for idx, disaster in enumerate(disaster_cache):
+            hit_score = 0
+            for word in qset:
+                for field, weight in _INDEX_FIELDS:
+                    if word in disaster.get(field, ''):
+                        hit_score += weight
+            if hit_score:
+                scores[idx] = hit_score
+
+    # 폴백 2: 키워드 히트가 전혀 없어도 구조 신호(카테고리/지역/심각도/최근)가
+    # 있으면 전체 레코드를 후보로 삼아 보너스만으로 순위를 매긴다
+    # ("recent disasters today" 같은 제안 쿼리가 빈 결과가 되지 않도록)
+    if not scores and qflags:
+        scores = dict.fromkeys(range(len(disaster_cache)), 0)
+
+    # 후보에 대해서만 보너스 적용
+    for idx, score in scores.items():
+        # 카테고리별 특별 점수 (비트 AND)
+        cat_code = _score_cat_codes[idx]
+        if cat_code >= 0 and qflags & (1 << cat_code):
+            score += 10
+
         # 지역별 특별 점수
-        location_bonuses = {
-            'japan': ['japan', 'japanese'],
-            'china': ['china', 'chinese'],
-            'usa': ['united states', 'america', 'california', 'texas'],
-            'indonesia': ['indonesia', 'java'],
-            'philippines': ['philippines', 'visayas'],
-            'bangladesh': ['bangladesh', 'sylhet']
-        }
-        
-        for region, location_keywords in location_bonuses.items():
-            if region in expanded_query:
-                for loc_keyword in location_keywords:
-                    if loc_keyword in location:
-                        score += 8
-        
-        # 심각도 기반 점수
-        severity_bonuses = {
-            'CRITICAL': 4,
-            'HIGH': 3,
-            'MEDIUM': 2,
-            'LOW': 1
-        }
-        
-        if any(word in ['severe', 'critical', 'major', 'serious', '심각한', '큰'] for word in query_words):
-            score += severity_bonuses.get(disaster.get('severity', 'LOW'), 0)
-        
+        if active_location_keywords:
+            location = disaster_cache[idx].get('_loc_lc', '')
+            for loc_keyword in active_location_keywords:
+                if loc_keyword in location:
+                    score += 8
+
+        # 심각도 기반 점수 (사전 계산된 보너스 컬럼)
+        if wants_severity:
+            score += _score_sev_bonus[idx]
+
         # 시간 기반 점수 (최근일수록 높은 점수)
-        if any(word in ['recent', 'latest', 'today', 'current', '최근', '오늘'] for word in query_words):
-            disaster_time = disaster.get('timestamp', 0)
-            current_time = int(datetime.now().timestamp())
-            days_ago = (current_time - disaster_time) / 86400
-            
+        if wants_recent:
+            days_ago = (current_time - _score_ts[idx]) / 86400
+
             if days_ago <= 1:
                 score += 5
             elif days_ago <= 3:
                 score += 3
             elif days_ago <= 7:
                 score += 1
-        
-        if score > 0:
-            disaster_copy = disaster.copy()
-            disaster_copy['search_score'] = score
-            matched_disasters.append(disaster_copy)
-    
-    # 점수순으로 정렬하고 결과 반환
-    matched_disasters.sort(key=lambda x: x.get('search_score', 0), reverse=True)
-    return matched_disasters[:max_results]
+
+        scores[idx] = score
+
+    # 상위 k개 (인덱스, 점수)만 반환 — dict 복사는 호출자 몫
+    return tuple(heapq.nlargest(max_results, scores.items(), key=itemgetter(1)))
 
 # ============================================================================
 # 에이전트 이벤트 핸들러
@@ -364,8 +553,9 @@ def search_disasters_by_query(query: str, max_results: int = 10) -> List[Dict]:
 @agent.on_event("startup")
 async def startup_handler(ctx: Context):
     """에이전트 시작 시 초기화 및 ASI:One 등록"""
-    global start_time
+    global start_time, AGENT_ADDR
     start_time = datetime.now()
+    AGENT_ADDR = str(agent.address)
     
     ctx.logger.info("🌍 WRLD Relief Disaster Agent starting...")
     ctx.logger.info(f"🔗 Agent address: {agent.address}")
@@ -385,32 +575,122 @@ async def startup_handler(ctx: Context):
     ctx.logger.info(f"🔍 ASI:One Search Keywords: {', '.join(search_keywords[:10])}...")
     ctx.logger.info(f"🆔 Agent ID: {agent.address}")
     
-    # 초기 데이터 로드
-    await refresh_disaster_data(ctx)
-    
+    # 초기 데이터 로드 (최근 스냅샷이 있으면 네트워크 왕복 생략)
+    if not _load_persisted_cache(ctx):
+        await refresh_disaster_data(ctx)
+
+    # 응답 배치 플러셔 시작
+    asyncio.create_task(_send_flusher(ctx))
+
     ctx.logger.info("✅ WRLD Relief Disaster Agent ready for ASI:One!")
     ctx.logger.info("🎯 Available interactions:")
     ctx.logger.info("   - Natural language chat: 'Show me earthquakes in Japan'")
     ctx.logger.info("   - Structured queries: DisasterQuery messages")
     ctx.logger.info("   - Status requests: AgentStatus messages")
 
+# 웜 스타트용 캐시 스냅샷 (재시작 시 USGS 왕복 생략)
+_PERSIST_PATH = '/tmp/wrld_relief_cache.pkl'
+_PERSIST_TTL = 3600
+
+
+def _persist_cache(ctx: Context):
+    """현재 캐시를 디스크에 스냅샷 (refresh 성공 시 호출)"""
+    try:
+        with open(_PERSIST_PATH, 'wb') as f:
+            pickle.dump({'cache': disaster_cache, 'ts': last_update}, f)
+    except Exception as e:
+        ctx.logger.warning(f"⚠️ Cache persist failed: {e}")
+
+
+def _load_persisted_cache(ctx: Context) -> bool:
+    """TTL 이내의 디스크 스냅샷이 있으면 로드하고 색인 재구축"""
+    global disaster_cache, last_update, last_update_mono
+    try:
+        if not os.path.exists(_PERSIST_PATH):
+            return False
+        age = time.time() - os.path.getmtime(_PERSIST_PATH)
+        if age > _PERSIST_TTL:
+            return False
+        with open(_PERSIST_PATH, 'rb') as f:
+            snapshot = pickle.load(f)
+        disaster_cache = snapshot['cache']
+        last_update = snapshot['ts']
+        last_update_mono = time.monotonic() - age
+        build_score_tables()
+        _rebuild_index()
+        ctx.logger.info(f"⚡ Warm start: loaded {len(disaster_cache)} disasters from snapshot ({int(age)}s old)")
+        return True
+    except Exception as e:
+        ctx.logger.warning(f"⚠️ Cache snapshot load failed: {e}")
+        return False
+
+
+@agent.on_event("shutdown")
+async def shutdown_handler(ctx: Context):
+    """에이전트 종료 시 공유 HTTP 세션 정리"""
+    if _HTTP_SESSION is not None and not _HTTP_SESSION.closed:
+        await _HTTP_SESSION.close()
+        ctx.logger.info("🔌 Shared HTTP session closed")
+
+# 동시 TTL 만료 시 refresh 1회만 실행 (thundering herd 방지)
+_refresh_lock = asyncio.Lock()
+
+
+async def ensure_fresh_data(ctx: Context):
+    """데이터가 오래되었으면 새로고침 — 락 + 이중 확인으로 중복 refresh 차단"""
+    if time.monotonic() - last_update_mono > 3600:
+        async with _refresh_lock:
+            if time.monotonic() - last_update_mono > 3600:
+                await refresh_disaster_data(ctx)
+
+
 async def refresh_disaster_data(ctx: Context):
     """재해 데이터 새로고침"""
-    global disaster_cache, last_update
+    global disaster_cache, last_update, last_update_mono
     
     try:
         ctx.logger.info("🔄 Refreshing disaster data...")
         
-        # 실제 USGS 지진 데이터
-        earthquakes = await fetch_usgs_earthquakes(ctx)
-        
-        # 시뮬레이션 재해 데이터
-        simulated_disasters = await fetch_simulated_disasters(ctx)
-        
-        # 데이터 통합
-        disaster_cache = earthquakes + simulated_disasters
-        last_update = int(datetime.now().timestamp())
+        # 실제 USGS 지진 + 시뮬레이션 데이터 동시 수집
+        earthquakes, simulated_disasters = await asyncio.gather(
+            fetch_usgs_earthquakes(ctx),
+            fetch_simulated_disasters(ctx)
+        )
         
+        # 증분 병합: id+timestamp가 같은 레코드는 기존 정규화본 재사용
+        prev_by_id = {d.get('id'): d for d in disaster_cache}
+        new_cache = []
+        fresh_items = []
+        for item in earthquakes + simulated_disasters:
+            prev = prev_by_id.get(item.get('id'))
+            if prev is not None and prev.get('timestamp') == item.get('timestamp'):
+                new_cache.append(prev)
+            else:
+                fresh_items.append(item)
+                new_cache.append(item)
+
+        unchanged = (
+            not fresh_items
+            and len(new_cache) == len(disaster_cache)
+            and all(a is b for a, b in zip(new_cache, disaster_cache))
+        )
+        last_update_mono = time.monotonic()
+
+        if unchanged:
+            # 캐시 내용 동일: 색인/SoA/검색 LRU 그대로 유지
+            ctx.logger.info(f"✅ Data unchanged, kept {len(disaster_cache)} disasters and existing index")
+            return
+
+        normalize_disasters(fresh_items)
+        disaster_cache = new_cache
+        last_update = int(time.time())
+
+        # 점수 계산용 SoA 컬럼 / 역색인 재구축 + 검색 LRU 비우기
+        build_score_tables()
+        _rebuild_index()
+        _search_cached.cache_clear()
+        _persist_cache(ctx)
+
         ctx.logger.info(f"✅ Loaded {len(disaster_cache)} total disasters")
         ctx.logger.info(f"   - {len(earthquakes)} real earthquakes from USGS")
         ctx.logger.info(f"   - {len(simulated_disasters)} simulated disasters")
@@ -422,6 +702,51 @@ async def refresh_disaster_data(ctx: Context):
 # 메시지 핸들러들
 # ============================================================================
 
+# DisasterResult 변환용 기본값 / 허용 필드 (매 레코드 11회 .get() 호출 제거)
+_RESULT_FIELDS = frozenset((
+    'id', 'title', 'description', 'location', 'severity', 'category',
+    'timestamp', 'source', 'confidence', 'affected_people', 'coordinates'
+))
+_RESULT_DEFAULTS = {
+    'id': '', 'title': '', 'description': '', 'location': '',
+    'severity': 'LOW', 'category': 'OTHER', 'timestamp': 0, 'source': '',
+    'confidence': 0.0, 'affected_people': 0,
+    'coordinates': {"lat": 0.0, "lng": 0.0}
+}
+
+# 내부 캐시 데이터는 이미 정제되어 있으므로 검증 없는 생성 사용
+# (pydantic v2는 model_construct, v1은 construct)
+_construct_result = getattr(DisasterResult, 'model_construct', None) or DisasterResult.construct
+
+# 버스트 쿼리 대응: 응답을 짧은 창 동안 모아 gather로 한꺼번에 전송
+_PENDING: List[tuple] = []
+_SEND_WAKEUP = asyncio.Event()
+
+
+def _queue_send(sender: str, payload) -> None:
+    """응답을 전송 큐에 넣고 플러셔를 깨운다"""
+    _PENDING.append((sender, payload))
+    _SEND_WAKEUP.set()
+
+
+async def _send_flusher(ctx: Context):
+    """10ms 디바운스 후 대기 중인 응답을 동시 전송하는 백그라운드 태스크"""
+    while True:
+        await _SEND_WAKEUP.wait()
+        await asyncio.sleep(0.01)  # 같은 버스트의 응답을 모을 시간
+        batch, _PENDING[:] = _PENDING[:], []
+        _SEND_WAKEUP.clear()
+        if batch:
+            results = await asyncio.gather(
+                *(ctx.send(to, payload) for to, payload in batch),
+                return_exceptions=True
+            )
+            # return_exceptions=True는 실패를 삼키므로 개별적으로 로깅
+            for (to, _payload), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    ctx.logger.error(f"❌ Batched send to {to} failed: {result}")
+
+
 @agent.on_message(model=DisasterQuery)
 async def handle_disaster_query(ctx: Context, sender: str, msg: DisasterQuery):
     """구조화된 재해 검색 쿼리 처리"""
@@ -432,36 +757,26 @@ async def handle_disaster_query(ctx: Context, sender: str, msg: DisasterQuery):
     
     try:
         # 데이터가 오래되었으면 새로고침 (1시간)
-        if int(datetime.now().timestamp()) - last_update > 3600:
-            await refresh_disaster_data(ctx)
+        await ensure_fresh_data(ctx)
         
         # 검색 실행
         matched_disasters = search_disasters_by_query(msg.query, msg.max_results)
         
-        # 결과 변환
-        disaster_results = []
-        for disaster in matched_disasters:
-            result = DisasterResult(
-                id=disaster.get('id', ''),
-                title=disaster.get('title', ''),
-                description=disaster.get('description', ''),
-                location=disaster.get('location', ''),
-                severity=disaster.get('severity', 'LOW'),
-                category=disaster.get('category', 'OTHER'),
-                timestamp=disaster.get('timestamp', 0),
-                source=disaster.get('source', ''),
-                confidence=disaster.get('confidence', 0.0),
-                affected_people=disaster.get('affected_people', 0),
-                coordinates=disaster.get('coordinates', {"lat": 0.0, "lng": 0.0})
-            )
-            disaster_results.append(result)
-        
+        # 결과 변환 (기본값 dict + 스플랫 병합, 검증 생략 생성)
+        disaster_results = [
+            _construct_result(**{
+                **_RESULT_DEFAULTS,
+                **{k: v for k, v in disaster.items() if k in _RESULT_FIELDS}
+            })
+            for disaster in matched_disasters
+        ]
+
         # 응답 생성
         results = DisasterResults(
             disasters=disaster_results,
             total_count=len(disaster_results),
             query=msg.query,
-            searched_at=int(datetime.now().timestamp()),
+            searched_at=int(time.time()),
             agent_name="WRLD Relief Disaster Agent"
         )
         
@@ -469,54 +784,52 @@ async def handle_disaster_query(ctx: Context, sender: str, msg: DisasterQuery):
         if disaster_results:
             ctx.logger.info(f"🎯 Top result: {disaster_results[0].title} ({disaster_results[0].category})")
         
-        await ctx.send(sender, results)
-        
+        _queue_send(sender, results)
+
     except Exception as e:
         ctx.logger.error(f"❌ Query processing error: {e}")
-        
+
         # 에러 시 빈 결과 전송
         error_results = DisasterResults(
             disasters=[],
             total_count=0,
             query=msg.query,
-            searched_at=int(datetime.now().timestamp()),
+            searched_at=int(time.time()),
             agent_name="WRLD Relief Disaster Agent (Error)"
         )
-        await ctx.send(sender, error_results)
+        _queue_send(sender, error_results)
 
-@agent.on_message(model=ChatMessage)
-async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
-    """ASI:One 호환 자연어 채팅 처리"""
-    global search_count
-    search_count += 1
-    
-    ctx.logger.info(f"💬 Chat message #{search_count} from {sender}: '{msg.message}'")
-    
-    try:
-        message_lower = msg.message.lower()
-        current_time = int(datetime.now().timestamp())
-        
-        # 재해 관련 키워드 감지
-        disaster_keywords = [
-            'earthquake', 'flood', 'fire', 'disaster', 'emergency', 'crisis',
-            'japan', 'california', 'tsunami', 'hurricane', 'typhoon', 'volcano',
-            'conflict', 'war', 'attack', 'wildfire', 'flooding', 'seismic',
-            '지진', '홍수', '재해', '재난', '일본', '미국', '태풍', '산불', '분쟁'
-        ]
-        
-        # 상태 확인 요청
-        if any(word in message_lower for word in ['status', 'health', 'info', 'about', '상태', '정보']):
-            uptime = datetime.now() - start_time
-            uptime_str = f"{uptime.days}d {uptime.seconds//3600}h {(uptime.seconds//60)%60}m"
-            
-            response_text = f"""🌍 **WRLD Relief Disaster Agent Status**
+# 채팅 분기용 키워드 (부분 문자열 매칭 유지:
+# 'disasters'/'floods'/'wildfires' 같은 굴절형도 히트해야 함)
+STATUS_KW = ('status', 'health', 'info', 'about', '상태', '정보')
+DISASTER_KW = (
+    'earthquake', 'flood', 'fire', 'disaster', 'emergency', 'crisis',
+    'japan', 'california', 'tsunami', 'hurricane', 'typhoon', 'volcano',
+    'conflict', 'war', 'attack', 'wildfire', 'flooding', 'seismic',
+    '지진', '홍수', '재해', '재난', '일본', '미국', '태풍', '산불', '분쟁'
+)
+HELP_KW = ('help', 'how', 'commands', 'what can', '도움', '명령어')
+
+# 키워드 → 분기 종류 테이블 + 단일 교대 패턴: 목록별 스캔 3회 대신
+# 메시지를 1회만 훑어 종류 집합을 구성 (v2의 _DISPATCH_RE와 동일 방식)
+_CHAT_KW_TO_KIND = {
+    kw: kind
+    for kind, keywords in (('status', STATUS_KW), ('disaster', DISASTER_KW), ('help', HELP_KW))
+    for kw in keywords
+}
+_CHAT_DISPATCH_RE = re.compile('|'.join(
+    map(re.escape, sorted(_CHAT_KW_TO_KIND, key=len, reverse=True))
+))
+
+# 정적 응답 템플릿 (매 호출 재구성 방지, 동적 값만 .format으로 주입)
+STATUS_TMPL = """🌍 **WRLD Relief Disaster Agent Status**
 
 🟢 **Status**: Online and monitoring
-📊 **Total Disasters**: {len(disaster_cache)}
-🔍 **Searches Performed**: {search_count}
-⏰ **Uptime**: {uptime_str}
-🔄 **Last Data Update**: {datetime.fromtimestamp(last_update).strftime('%Y-%m-%d %H:%M:%S') if last_update else 'Never'}
-🆔 **Agent Address**: {agent.address}
+📊 **Total Disasters**: {n_disasters}
+🔍 **Searches Performed**: {n_searches}
+⏰ **Uptime**: {uptime}
+🔄 **Last Data Update**: {last_update}
+🆔 **Agent Address**: {address}
 
 **Available Commands:**
 • "Show me earthquakes in Japan"
@@ -525,58 +838,8 @@ async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
 • "Tell me about recent wildfires"
 
 Ready to help with global disaster monitoring! 🚨"""
-        
-        # 재해 검색 요청
-        elif any(keyword in message_lower for keyword in disaster_keywords):
-            # 데이터 새로고침 확인
-            if int(datetime.now().timestamp()) - last_update > 3600:
-                await refresh_disaster_data(ctx)
-            
-            # 검색 실행
-            disasters = search_disasters_by_query(msg.message, 5)
-            
-            if disasters:
-                response_text = f"🚨 **Found {len(disasters)} disasters related to your query:**\n\n"
-                
-                for i, disaster in enumerate(disasters, 1):
-                    # 시간 포맷팅
-                    disaster_time = datetime.fromtimestamp(disaster['timestamp'])
-                    time_ago = datetime.now() - disaster_time
-                    
-                    if time_ago.days > 0:
-                        time_str = f"{time_ago.days} days ago"
-                    elif time_ago.seconds > 3600:
-                        time_str = f"{time_ago.seconds//3600} hours ago"
-                    else:
-                        time_str = f"{time_ago.seconds//60} minutes ago"
-                    
-                    # 심각도 이모지
-                    severity_emoji = {
-                        'CRITICAL': '🔴',
-                        'HIGH': '🟠', 
-                        'MEDIUM': '🟡',
-                        'LOW': '🟢'
-                    }.get(disaster['severity'], '⚪')
-                    
-                    response_text += f"**{i}. {disaster['title']}**\n"
-                    response_text += f"📍 **Location**: {disaster['location']}\n"
-                    response_text += f"{severity_emoji} **Severity**: {disaster['severity']}\n"
-                    response_text += f"📂 **Category**: {disaster['category']}\n"
-                    response_text += f"⏰ **Time**: {time_str}\n"
-                    response_text += f"📰 **Source**: {disaster['source']}\n"
-                    
-                    if disaster.get('affected_people', 0) > 0:
-                        response_text += f"👥 **Affected**: {disaster['affected_people']:,} people\n"
-                    
-                    response_text += f"📝 **Details**: {disaster['description']}\n\n"
-                
-                response_text += "💡 **Need more specific information?** Try asking about:\n"
-                response_text += "• Specific locations: 'earthquakes in Japan'\n"
-                response_text += "• Disaster types: 'recent floods'\n"
-                response_text += "• Severity levels: 'critical disasters today'"
-                
-            else:
-                response_text = f"""🔍 **No disasters found for '{msg.message}'**
+
+NO_RESULTS_TMPL = """🔍 **No disasters found for '{query}'**
 
 This could mean:
 • No recent disasters match your criteria
@@ -584,23 +847,21 @@ This could mean:
 • Check spelling of location names
 
 **Suggestions:**
-• "earthquakes in Japan" 
+• "earthquakes in Japan"
 • "floods in Bangladesh"
 • "wildfires in California"
 • "recent disasters today"
 • "high severity emergencies"
 
-I'm monitoring {len(disaster_cache)} disasters globally! 🌍"""
-        
-        # 도움말 요청
-        elif any(word in message_lower for word in ['help', 'how', 'what can', 'commands', '도움', '명령어']):
-            response_text = """🌍 **WRLD Relief Disaster Monitoring Agent**
+I'm monitoring {n_disasters} disasters globally! 🌍"""
+
+HELP_TEXT = """🌍 **WRLD Relief Disaster Monitoring Agent**
 
 I provide real-time information about global disasters and emergencies!
 
 **🔍 What I can help with:**
 • 🌏 **Global disaster monitoring** - earthquakes, floods, wildfires, hurricanes
-• 📊 **Real-time updates** - latest disaster information from USGS and other sources  
+• 📊 **Real-time updates** - latest disaster information from USGS and other sources
 • 🗺️ **Location-based search** - disasters in specific countries/regions
 • ⚠️ **Severity assessment** - critical, high, medium, low severity levels
 • 📈 **Impact analysis** - affected population and damage estimates
@@ -618,29 +879,127 @@ I provide real-time information about global disasters and emergencies!
 • Global disaster monitoring networks
 
 Ready to help you stay informed about global emergencies! 🚨"""
-        
-        # 일반 인사
-        else:
-            response_text = f"""👋 **Hello! I'm the WRLD Relief Disaster Monitoring Agent**
+
+GREETING_TMPL = """👋 **Hello! I'm the WRLD Relief Disaster Monitoring Agent**
 
 I specialize in providing real-time information about global disasters and emergencies.
 
-**🚨 Currently monitoring {len(disaster_cache)} disasters worldwide**
+**🚨 Currently monitoring {n_disasters} disasters worldwide**
 
 **Quick examples to try:**
 • "Show me earthquakes in Japan" 🗾
-• "What disasters happened today?" 📅  
+• "What disasters happened today?" 📅
 • "Any floods in Bangladesh?" 🌊
 • "Tell me about recent wildfires" 🔥
 • "Status" - for system information 📊
 
 I'm here 24/7 to help you stay informed about global emergencies and disasters. What would you like to know? 🌍"""
+
+
+@agent.on_message(model=ChatMessage)
+async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
+    """ASI:One 호환 자연어 채팅 처리"""
+    global search_count, _status_cache
+    search_count += 1
+
+    ctx.logger.info(f"💬 Chat message #{search_count} from {sender}: '{msg.message}'")
+
+    try:
+        message_lower = msg.message.lower()
+        # 단일 스캔으로 매칭된 분기 종류 집합 구성 (우선순위는 아래 사다리 순서)
+        kinds = {_CHAT_KW_TO_KIND[m] for m in _CHAT_DISPATCH_RE.findall(message_lower)}
+        current_time = int(time.time())
+
+        # 상태 확인 요청 (5초 TTL 캐시: 폴링성 상태 요청의 재렌더링 방지)
+        if 'status' in kinds:
+            cached_at, cached_text = _status_cache
+            if cached_text and time.monotonic() - cached_at < 5.0:
+                response_text = cached_text
+            else:
+                uptime = datetime.now() - start_time
+                uptime_str = f"{uptime.days}d {uptime.seconds//3600}h {(uptime.seconds//60)%60}m"
+
+                response_text = STATUS_TMPL.format(
+                    n_disasters=len(disaster_cache),
+                    n_searches=search_count,
+                    uptime=uptime_str,
+                    last_update=datetime.fromtimestamp(last_update).strftime('%Y-%m-%d %H:%M:%S') if last_update else 'Never',
+                    address=AGENT_ADDR
+                )
+                _status_cache = (time.monotonic(), response_text)
+        
+        # 재해 검색 요청
+        elif 'disaster' in kinds:
+            # 데이터 새로고침 확인
+            await ensure_fresh_data(ctx)
+            
+            # 검색 실행
+            disasters = search_disasters_by_query(msg.message, 5)
+            
+            if disasters:
+                # 문자열 누적 대신 파츠 리스트 + join (O(n²) 재할당 방지)
+                parts = [f"🚨 **Found {len(disasters)} disasters related to your query:**\n\n"]
+
+                for i, disaster in enumerate(disasters, 1):
+                    # 시간 포맷팅
+                    disaster_time = datetime.fromtimestamp(disaster['timestamp'])
+                    time_ago = datetime.now() - disaster_time
+
+                    if time_ago.days > 0:
+                        time_str = f"{time_ago.days} days ago"
+                    elif time_ago.seconds > 3600:
+                        time_str = f"{time_ago.seconds//3600} hours ago"
+                    else:
+                        time_str = f"{time_ago.seconds//60} minutes ago"
+
+                    # 심각도 이모지
+                    severity_emoji = {
+                        'CRITICAL': '🔴',
+                        'HIGH': '🟠',
+                        'MEDIUM': '🟡',
+                        'LOW': '🟢'
+                    }.get(disaster['severity'], '⚪')
+
+                    parts.append(
+                        f"**{i}. {disaster['title']}**\n"
+                        f"📍 **Location**: {disaster['location']}\n"
+                        f"{severity_emoji} **Severity**: {disaster['severity']}\n"
+                        f"📂 **Category**: {disaster['category']}\n"
+                        f"⏰ **Time**: {time_str}\n"
+                        f"📰 **Source**: {disaster['source']}\n"
+                    )
+
+                    if disaster.get('affected_people', 0) > 0:
+                        parts.append(f"👥 **Affected**: {disaster['affected_people']:,} people\n")
+
+                    parts.append(f"📝 **Details**: {disaster['description']}\n\n")
+
+                parts.append(
+                    "💡 **Need more specific information?** Try asking about:\n"
+                    "• Specific locations: 'earthquakes in Japan'\n"
+                    "• Disaster types: 'recent floods'\n"
+                    "• Severity levels: 'critical disasters today'"
+                )
+                response_text = "".join(parts)
+
+            else:
+                response_text = NO_RESULTS_TMPL.format(
+                    query=msg.message, n_disasters=len(disaster_cache)
+                )
+        
+        # 도움말 요청
+        elif 'help' in kinds:
+            response_text = HELP_TEXT
+
+        # 일반 인사
+        else:
+            response_text = GREETING_TMPL.format(n_disasters=len(disaster_cache))
         
         # 응답 전송
         response = UAgentResponse(
             message=response_text,
             type="disaster_info",
-            agent_address=str(agent.address),
+            agent_address=AGENT_ADDR,
             timestamp=current_time
         )
         
@@ -652,8 +1011,8 @@ I'm here 24/7 to help you stay informed about global emergencies and disasters.
         error_response = UAgentResponse(
             message="🚨 Sorry, I encountered an error processing your request. Please try again or ask for 'help' to see available commands.",
             type="error",
-            agent_address=str(agent.address),
-            timestamp=int(datetime.now().timestamp())
+            agent_address=AGENT_ADDR,
+            timestamp=int(time.time())
         )
         await ctx.send(sender, error_response)
 
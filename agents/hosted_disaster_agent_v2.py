@@ -5,6 +5,7 @@ Real-time disaster monitoring with natural language chat support
 """
 
 from datetime import datetime
+from functools import lru_cache
 from uuid import uuid4
 from uagents import Agent, Context, Protocol
 from uagents_core.contrib.protocols.chat import (
@@ -15,8 +16,13 @@ from uagents_core.contrib.protocols.chat import (
     chat_protocol_spec,
 )
 import aiohttp
+import bisect
+import heapq
+import itertools
 import json
 import asyncio
+import random
+import time
 from typing import List, Dict, Any
 import re
 
@@ -40,12 +46,100 @@ protocol = Protocol(spec=chat_protocol_spec)
 
 disaster_cache = []
 last_update = 0
-search_count = 0
-start_time = datetime.now()
+data_version = 0  # refresh마다 증가 — 렌더링 캐시 무효화 키
+_search_counter = itertools.count(1)  # C 레벨 원자적 증가 (GIL-free 빌드에서도 안전)
+search_count = 0  # 상태/헬스 체크 표시용 마지막 발급 번호
+START_MONO = time.monotonic()  # 가동시간 계산용 (벽시계 점프에 영향받지 않음)
+
+
+def _uptime_str() -> str:
+    """경과 초를 monotonic 차이 한 번으로 계산해 'Xd Yh Zm'으로 포맷"""
+    elapsed = int(time.monotonic() - START_MONO)
+    days, rem = divmod(elapsed, 86400)
+    hours, rem = divmod(rem, 3600)
+    return f"{days}d {hours}h {rem // 60}m"
 
 # 재해 모니터링 전문 분야 설정
 subject_matter = "global disaster monitoring, earthquakes, floods, wildfires, hurricanes, emergency response, and crisis management"
 
+# 응답 템플릿 (모듈 로드 시 1회 조립, 동적 값만 .format으로 주입)
+STATUS_TMPL = f"""🌍 **WRLD Relief Disaster Agent Status**
+
+🟢 **Status**: Online and monitoring
+📊 **Total Disasters**: {{n_disasters}}
+🔍 **Searches Performed**: {{n_searches}}
+⏰ **Uptime**: {{uptime}}
+🔄 **Last Data Update**: {{last_update}}
+🆔 **Agent Address**: {{address}}
+
+**I specialize in {subject_matter}.**
+
+**Available Commands:**
+• "Show me earthquakes in Japan"
+• "What disasters happened today?"
+• "Any floods in Bangladesh?"
+• "Tell me about recent wildfires"
+
+Ready to help with global disaster monitoring! 🚨"""
+
+NO_RESULTS_TMPL = """🔍 **No disasters found for '{query}'**
+
+This could mean:
+• No recent disasters match your criteria
+• Try different keywords or locations
+• Check spelling of location names
+
+**Suggestions:**
+• "earthquakes in Japan"
+• "floods in Bangladesh"
+• "wildfires in California"
+• "recent disasters today"
+• "high severity emergencies"
+
+I'm monitoring {n_disasters} disasters globally! 🌍"""
+
+HELP_TEXT = f"""🌍 **WRLD Relief Disaster Monitoring Agent**
+
+I'm an expert in **{subject_matter}**.
+
+**🔍 What I can help with:**
+• 🌏 **Global disaster monitoring** - earthquakes, floods, wildfires, hurricanes
+• 📊 **Real-time updates** - latest disaster information from USGS and other sources
+• 🗺️ **Location-based search** - disasters in specific countries/regions
+• ⚠️ **Severity assessment** - critical, high, medium, low severity levels
+• 📈 **Impact analysis** - affected population and damage estimates
+
+**💬 Example queries:**
+• "Show me recent earthquakes in Japan"
+• "What floods happened this week?"
+• "Any wildfires in California?"
+• "Tell me about critical disasters today"
+• "Disasters in Southeast Asia"
+
+**🌐 Data sources:**
+• USGS (earthquakes)
+• ReliefWeb (humanitarian crises)
+• Global disaster monitoring networks
+
+Ready to help you stay informed about global emergencies! 🚨"""
+
+OFFTOPIC_TMPL = f"""👋 **Hello! I'm the WRLD Relief Disaster Monitoring Agent**
+
+I specialize in **{subject_matter}**.
+
+If you're asking about other topics, I politely say that I don't know about them as I focus specifically on disaster monitoring and emergency response.
+
+**🚨 Currently monitoring {{n_disasters}} disasters worldwide**
+
+**Quick examples to try:**
+• "Show me earthquakes in Japan" 🗾
+• "What disasters happened today?" 📅
+• "Any floods in Bangladesh?" 🌊
+• "Tell me about recent wildfires" 🔥
+• "Status" - for system information 📊
+
+I'm here 24/7 to help you stay informed about global emergencies and disasters. What would you like to know? 🌍"""
+
 # ============================================================================
 # 데이터 수집 함수들
 # ============================================================================
@@ -187,133 +281,245 @@ def estimate_affected_people(magnitude: float) -> int:
 # 검색 엔진
 # ============================================================================
 
-def search_disasters_by_query(query: str, max_results: int = 5) -> List[Dict]:
-    """고급 재해 검색 엔진"""
-    query_lower = query.lower()
-    matched_disasters = []
-    
-    # 한국어-영어 키워드 매핑
-    korean_mappings = {
-        '지진': ['earthquake', 'seismic'],
-        '홍수': ['flood', 'flooding'],
-        '산불': ['fire', 'wildfire'],
-        '태풍': ['hurricane', 'typhoon', 'cyclone'],
-        '화산': ['volcano', 'volcanic'],
-        '분쟁': ['war', 'conflict', 'attack'],
-        '재해': ['disaster', 'emergency'],
-        '재난': ['disaster', 'catastrophe'],
-        '일본': ['japan', 'japanese'],
-        '중국': ['china', 'chinese'],
-        '미국': ['usa', 'america', 'united states'],
-        '인도네시아': ['indonesia', 'indonesian'],
-        '필리핀': ['philippines', 'philippine'],
-        '방글라데시': ['bangladesh'],
-        '최근': ['recent', 'latest'],
-        '오늘': ['today', 'current'],
-        '어제': ['yesterday'],
-        '심각한': ['severe', 'critical', 'major'],
-        '큰': ['large', 'big', 'major']
-    }
-    
+# 한국어-영어 키워드 매핑
+korean_mappings = {
+    '지진': ['earthquake', 'seismic'],
+    '홍수': ['flood', 'flooding'],
+    '산불': ['fire', 'wildfire'],
+    '태풍': ['hurricane', 'typhoon', 'cyclone'],
+    '화산': ['volcano', 'volcanic'],
+    '분쟁': ['war', 'conflict', 'attack'],
+    '재해': ['disaster', 'emergency'],
+    '재난': ['disaster', 'catastrophe'],
+    '일본': ['japan', 'japanese'],
+    '중국': ['china', 'chinese'],
+    '미국': ['usa', 'america', 'united states'],
+    '인도네시아': ['indonesia', 'indonesian'],
+    '필리핀': ['philippines', 'philippine'],
+    '방글라데시': ['bangladesh'],
+    '최근': ['recent', 'latest'],
+    '오늘': ['today', 'current'],
+    '어제': ['yesterday'],
+    '심각한': ['severe', 'critical', 'major'],
+    '큰': ['large', 'big', 'major']
+}
+
+# 카테고리별 특별 점수
+category_bonuses = {
+    'earthquake': 'EARTHQUAKE',
+    'seismic': 'EARTHQUAKE',
+    'flood': 'FLOOD',
+    'flooding': 'FLOOD',
+    'fire': 'WILDFIRE',
+    'wildfire': 'WILDFIRE',
+    'hurricane': 'HURRICANE',
+    'typhoon': 'HURRICANE',
+    'cyclone': 'HURRICANE',
+    'volcano': 'VOLCANO',
+    'volcanic': 'VOLCANO',
+    'conflict': 'CONFLICT',
+    'war': 'CONFLICT',
+    'attack': 'CONFLICT'
+}
+
+# 지역별 특별 점수
+location_bonuses = {
+    'japan': ['japan', 'japanese'],
+    'china': ['china', 'chinese'],
+    'usa': ['united states', 'america', 'california', 'texas'],
+    'indonesia': ['indonesia', 'java'],
+    'philippines': ['philippines', 'visayas'],
+    'bangladesh': ['bangladesh', 'sylhet']
+}
+
+# 심각도 기반 점수
+severity_bonuses = {
+    'CRITICAL': 4,
+    'HIGH': 3,
+    'MEDIUM': 2,
+    'LOW': 1
+}
+
+# 보너스 트리거 단어들 (O(1) 해시 집합 교집합용)
+SEVERITY_TRIGGER_WORDS = frozenset(('severe', 'critical', 'major', 'serious', '심각한', '큰'))
+RECENCY_WORDS = frozenset(('recent', 'latest', 'today', 'current', '최근', '오늘'))
+
+# 필드별 가중치: title / description / location / category
+_FIELD_WEIGHTS = (5, 3, 4, 2)
+
+# 심각도 → 이모지 (렌더링 루프에서 dict 재생성 방지)
+SEVERITY_EMOJI = {
+    'CRITICAL': '🔴',
+    'HIGH': '🟠',
+    'MEDIUM': '🟡',
+    'LOW': '🟢'
+}
+
+# 재해 1건 렌더링 템플릿 — f-string 8개 대신 format_map 1회
+DISASTER_TMPL = (
+    "**{i}. {title}**\n"
+    "📍 **Location**: {location}\n"
+    "{sev_emoji} **Severity**: {severity}\n"
+    "📂 **Category**: {category}\n"
+    "⏰ **Time**: {time_str}\n"
+    "📰 **Source**: {source}\n"
+    "{affected_line}"
+    "📝 **Details**: {description}\n\n"
+)
+
+
+def normalize_disasters(disasters: List[Dict]) -> List[Dict]:
+    """수집 시점에 소문자 필드를 1회 캐시 (쿼리마다 lower() 재실행 방지)"""
+    for disaster in disasters:
+        disaster['_title_lc'] = disaster.get('title', '').lower()
+        disaster['_desc_lc'] = disaster.get('description', '').lower()
+        disaster['_loc_lc'] = disaster.get('location', '').lower()
+        disaster['_cat_lc'] = disaster.get('category', '').lower()
+    return disasters
+
+
+def search_disasters_by_query(query_lower: str, max_results: int = 5) -> List[Dict]:
+    """고급 재해 검색 엔진 (재해당 단일 패스 키워드 매칭)
+
+    query_lower는 호출자가 이미 소문자로 변환한 문자열을 받는다
+    (디스패치 단계에서 만든 text_lower 재사용, lower() 중복 방지).
+    """
     # 쿼리 확장 (한국어 → 영어)
     expanded_query = query_lower
     for korean, english_words in korean_mappings.items():
         if korean in query_lower:
             expanded_query += ' ' + ' '.join(english_words)
-    
-    query_words = expanded_query.split()
-    
-    for disaster in disaster_cache:
+
+    query_words = [word for word in expanded_query.split() if len(word) >= 2]
+    qset = frozenset(query_words)
+
+    # 쿼리 단어들을 단일 패턴으로 컴파일 → 재해당 한 번의 선형 스캔으로 매칭
+    unique_words = sorted(qset, key=len, reverse=True)
+    word_pattern = re.compile('|'.join(map(re.escape, unique_words))) if unique_words else None
+
+    # 카테고리/지역/심각도/시간 보너스는 쿼리당 1회만 계산
+    active_categories = {cat for keyword, cat in category_bonuses.items() if keyword in expanded_query}
+    active_location_keywords = [
+        loc_keyword
+        for region, location_keywords in location_bonuses.items() if region in expanded_query
+        for loc_keyword in location_keywords
+    ]
+    wants_severity = bool(qset & SEVERITY_TRIGGER_WORDS)
+    wants_recent = bool(qset & RECENCY_WORDS)
+    current_time = int(datetime.now().timestamp())
+
+    scored = []
+
+    for idx, disaster in enumerate(disaster_cache):
         score = 0
-        
-        title = disaster.get('title', '').lower()
-        description = disaster.get('description', '').lower()
-        location = disaster.get('location', '').lower()
-        category = disaster.get('category', '').lower()
-        
-        # 기본 키워드 매칭
-        for word in query_words:
-            if len(word) < 2:
-                continue
-                
-            if word in title:
-                score += 5
-            if word in description:
-                score += 3
-            if word in location:
-                score += 4
-            if word in category:
-                score += 2
-        
+
+        title = disaster.get('_title_lc', '')
+        description = disaster.get('_desc_lc', '')
+        location = disaster.get('_loc_lc', '')
+        category = disaster.get('_cat_lc', '')
+
+        # 기본 키워드 매칭: 4개 필드를 \x00으로 연결해 한 번에 스캔
+        if word_pattern is not None:
+            text = '\x00'.join((title, description, location, category))
+            t_end = len(title)
+            d_end = t_end + 1 + len(description)
+            l_end = d_end + 1 + len(location)
+            boundaries = (t_end, d_end, l_end)
+
+            for match in word_pattern.finditer(text):
+                field = bisect.bisect_right(boundaries, match.start())
+                score += _FIELD_WEIGHTS[field]
+
         # 카테고리별 특별 점수
-        category_bonuses = {
-            'earthquake': 'EARTHQUAKE',
-            'seismic': 'EARTHQUAKE',
-            'flood': 'FLOOD',
-            'flooding': 'FLOOD',
-            'fire': 'WILDFIRE',
-            'wildfire': 'WILDFIRE',
-            'hurricane': 'HURRICANE',
-            'typhoon': 'HURRICANE',
-            'cyclone': 'HURRICANE',
-            'volcano': 'VOLCANO',
-            'volcanic': 'VOLCANO',
-            'conflict': 'CONFLICT',
-            'war': 'CONFLICT',
-            'attack': 'CONFLICT'
-        }
-        
-        for keyword, cat in category_bonuses.items():
-            if keyword in expanded_query and disaster.get('category') == cat:
-                score += 10
-        
+        if disaster.get('category') in active_categories:
+            score += 10
+
         # 지역별 특별 점수
-        location_bonuses = {
-            'japan': ['japan', 'japanese'],
-            'china': ['china', 'chinese'],
-            'usa': ['united states', 'america', 'california', 'texas'],
-            'indonesia': ['indonesia', 'java'],
-            'philippines': ['philippines', 'visayas'],
-            'bangladesh': ['bangladesh', 'sylhet']
-        }
-        
-        for region, location_keywords in location_bonuses.items():
-            if region in expanded_query:
-                for loc_keyword in location_keywords:
-                    if loc_keyword in location:
-                        score += 8
-        
+        for loc_keyword in active_location_keywords:
+            if loc_keyword in location:
+                score += 8
+
         # 심각도 기반 점수
-        severity_bonuses = {
-            'CRITICAL': 4,
-            'HIGH': 3,
-            'MEDIUM': 2,
-            'LOW': 1
-        }
-        
-        if any(word in ['severe', 'critical', 'major', 'serious', '심각한', '큰'] for word in query_words):
+        if wants_severity:
             score += severity_bonuses.get(disaster.get('severity', 'LOW'), 0)
-        
+
         # 시간 기반 점수
-        if any(word in ['recent', 'latest', 'today', 'current', '최근', '오늘'] for word in query_words):
+        if wants_recent:
             disaster_time = disaster.get('timestamp', 0)
-            current_time = int(datetime.now().timestamp())
             days_ago = (current_time - disaster_time) / 86400
-            
+
             if days_ago <= 1:
                 score += 5
             elif days_ago <= 3:
                 score += 3
             elif days_ago <= 7:
                 score += 1
-        
+
         if score > 0:
-            disaster_copy = disaster.copy()
-            disaster_copy['search_score'] = score
-            matched_disasters.append(disaster_copy)
-    
-    matched_disasters.sort(key=lambda x: x.get('search_score', 0), reverse=True)
-    return matched_disasters[:max_results]
+            scored.append((score, idx))
+
+    # O(N log k) 상위 k개 선택, 선택된 것만 복사
+    matched_disasters = []
+    for score, idx in heapq.nlargest(max_results, scored):
+        disaster_copy = disaster_cache[idx].copy()
+        disaster_copy['search_score'] = score
+        matched_disasters.append(disaster_copy)
+
+    return matched_disasters
+
+@lru_cache(maxsize=512)
+def _render_search(query_lower: str, version: int) -> str:
+    """검색 결과 응답 렌더링 (쿼리 + 데이터 버전 키 메모이즈)
+
+    version은 refresh_disaster_data가 올리는 data_version —
+    새 데이터가 들어오면 키가 바뀌어 자연히 재계산되고,
+    이전 버전 항목은 LRU로 밀려난다.
+    """
+    disasters = search_disasters_by_query(query_lower, 5)
+
+    if not disasters:
+        return NO_RESULTS_TMPL.format(query=query_lower, n_disasters=len(disaster_cache))
+
+    # 파츠 리스트 + join (반복 += 재할당 방지)
+    parts = [f"🚨 **Found {len(disasters)} disasters related to your query:**\n\n"]
+
+    # 루프 밖에서 1회만 시각 조회, 이후 정수 연산만 사용
+    now_ts = int(time.time())
+
+    for i, disaster in enumerate(disasters, 1):
+        # 시간 포맷팅 (datetime 없이 경과 초 정수 계산)
+        delta = now_ts - disaster['timestamp']
+
+        if delta >= 86400:
+            time_str = f"{delta // 86400} days ago"
+        elif delta >= 3600:
+            time_str = f"{delta // 3600} hours ago"
+        else:
+            time_str = f"{delta // 60} minutes ago"
+
+        affected = disaster.get('affected_people', 0)
+
+        parts.append(DISASTER_TMPL.format_map({
+            'i': i,
+            'title': disaster['title'],
+            'location': disaster['location'],
+            'sev_emoji': SEVERITY_EMOJI.get(disaster['severity'], '⚪'),
+            'severity': disaster['severity'],
+            'category': disaster['category'],
+            'time_str': time_str,
+            'source': disaster['source'],
+            'affected_line': f"👥 **Affected**: {affected:,} people\n" if affected > 0 else "",
+            'description': disaster['description'],
+        }))
+
+    parts.append(
+        "💡 **Need more specific information?** Try asking about:\n"
+        "• Specific locations: 'earthquakes in Japan'\n"
+        "• Disaster types: 'recent floods'\n"
+        "• Severity levels: 'critical disasters today'"
+    )
+
+    return "".join(parts)
 
 # ============================================================================
 # 에이전트 이벤트 핸들러
@@ -322,9 +528,9 @@ def search_disasters_by_query(query: str, max_results: int = 5) -> List[Dict]:
 @agent.on_event("startup")
 async def startup_handler(ctx: Context):
     """에이전트 시작 시 초기화 및 ASI:One 등록"""
-    global start_time
-    start_time = datetime.now()
-    
+    global START_MONO
+    START_MONO = time.monotonic()
+
     ctx.logger.info("🌍 WRLD Relief Disaster Agent (ASI:One Compatible) starting...")
     ctx.logger.info(f"🔗 Agent address: {agent.address}")
     
@@ -346,33 +552,45 @@ async def startup_handler(ctx: Context):
     
     # 초기 데이터 로드
     await refresh_disaster_data(ctx)
-    
+
+    # 지터 적용 주기 작업 시작
+    asyncio.create_task(periodic_data_refresh(ctx))
+    asyncio.create_task(periodic_health_check(ctx))
+
     ctx.logger.info("✅ WRLD Relief Disaster Agent ready for ASI:One Chat Protocol!")
     ctx.logger.info("🎯 Available via ASI:One search: 'disaster monitoring', 'WRLD Relief'")
 
+# 동시 refresh 직렬화 (요청 경로는 항상 기존 캐시를 읽는다)
+_refresh_lock = asyncio.Lock()
+
+
 async def refresh_disaster_data(ctx: Context):
-    """재해 데이터 새로고침"""
-    global disaster_cache, last_update
-    
-    try:
-        ctx.logger.info("🔄 Refreshing disaster data...")
-        
-        # 실제 USGS 지진 데이터
-        earthquakes = await fetch_usgs_earthquakes(ctx)
-        
-        # 시뮬레이션 재해 데이터
-        simulated_disasters = await fetch_simulated_disasters(ctx)
-        
-        # 데이터 통합
-        disaster_cache = earthquakes + simulated_disasters
-        last_update = int(datetime.now().timestamp())
-        
-        ctx.logger.info(f"✅ Loaded {len(disaster_cache)} total disasters")
-        ctx.logger.info(f"   - {len(earthquakes)} real earthquakes from USGS")
-        ctx.logger.info(f"   - {len(simulated_disasters)} simulated disasters")
-        
-    except Exception as e:
-        ctx.logger.error(f"❌ Data refresh error: {e}")
+    """재해 데이터 새로고침 — 섀도 빌드 후 원자적 교체"""
+    global disaster_cache, last_update, data_version
+
+    async with _refresh_lock:
+        try:
+            ctx.logger.info("🔄 Refreshing disaster data...")
+
+            # 실제 USGS 지진 데이터
+            earthquakes = await fetch_usgs_earthquakes(ctx)
+
+            # 시뮬레이션 재해 데이터
+            simulated_disasters = await fetch_simulated_disasters(ctx)
+
+            # 섀도 리스트에서 정규화를 끝낸 뒤 참조를 한 번에 교체
+            # (수집/정규화 동안에도 독자는 기존 캐시를 계속 읽음)
+            next_cache = normalize_disasters(earthquakes + simulated_disasters)
+            disaster_cache = next_cache
+            last_update = int(datetime.now().timestamp())
+            data_version += 1  # 렌더링 캐시 키 버전 — 이전 버전 응답은 LRU로 소멸
+
+            ctx.logger.info(f"✅ Loaded {len(disaster_cache)} total disasters")
+            ctx.logger.info(f"   - {len(earthquakes)} real earthquakes from USGS")
+            ctx.logger.info(f"   - {len(simulated_disasters)} simulated disasters")
+
+        except Exception as e:
+            ctx.logger.error(f"❌ Data refresh error: {e}")
 
 # ============================================================================
 # 공식 Chat Protocol 핸들러
@@ -382,15 +600,18 @@ async def refresh_disaster_data(ctx: Context):
 async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
     """ASI:One 공식 Chat Protocol 메시지 핸들러"""
     global search_count
-    search_count += 1
-    
-    # 메시지 수신 확인 전송
-    await ctx.send(
+    search_count = next(_search_counter)
+
+    # 핸들러당 시각 조회 1회 — ack와 응답 메시지가 같은 타임스탬프를 공유
+    now = datetime.utcnow()
+
+    # 메시지 수신 확인은 비차단 전송 — 응답 생성과 ack 네트워크 I/O를 겹침
+    ack_task = asyncio.create_task(ctx.send(
         sender,
-        ChatAcknowledgement(timestamp=datetime.now(), acknowledged_msg_id=msg.msg_id),
-    )
-    
-    ctx.logger.info(f"💬 Chat message #{search_count} from {sender}")
+        ChatAcknowledgement(timestamp=now, acknowledged_msg_id=msg.msg_id),
+    ))
+
+    ctx.logger.info("💬 Chat message #%d from %s", search_count, sender)
     
     # 텍스트 내용 추출
     text = ''
@@ -398,14 +619,14 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
         if isinstance(item, TextContent):
             text += item.text
     
-    ctx.logger.info(f"📝 Message content: '{text}'")
+    ctx.logger.info("📝 Message content: '%s'", text)
     
     # 응답 생성
     response_text = await generate_disaster_response(ctx, text)
     
     # 공식 Chat Protocol 형식으로 응답 전송
     await ctx.send(sender, ChatMessage(
-        timestamp=datetime.utcnow(),
+        timestamp=now,
         msg_id=uuid4(),
         content=[
             TextContent(type="text", text=response_text),
@@ -413,180 +634,113 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
         ]
     ))
 
+    # ack 전송 오류를 묻어두지 않도록 마지막에 회수
+    await ack_task
+
 @protocol.on_message(ChatAcknowledgement)
 async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
     """메시지 수신 확인 처리"""
-    ctx.logger.info(f"✅ Message acknowledged by {sender}")
-
-async def generate_disaster_response(ctx: Context, text: str) -> str:
-    """재해 관련 응답 생성"""
-    try:
-        text_lower = text.lower()
-        
-        # 데이터 새로고침 확인
-        if int(datetime.now().timestamp()) - last_update > 3600:
-            await refresh_disaster_data(ctx)
-        
-        # 재해 관련 키워드 감지
-        disaster_keywords = [
-            'earthquake', 'flood', 'fire', 'disaster', 'emergency', 'crisis',
-            'japan', 'california', 'tsunami', 'hurricane', 'typhoon', 'volcano',
-            'conflict', 'war', 'attack', 'wildfire', 'flooding', 'seismic',
-            '지진', '홍수', '재해', '재난', '일본', '미국', '태풍', '산불', '분쟁'
-        ]
-        
-        # 상태 확인 요청
-        if any(word in text_lower for word in ['status', 'health', 'info', 'about', '상태', '정보']):
-            uptime = datetime.now() - start_time
-            uptime_str = f"{uptime.days}d {uptime.seconds//3600}h {(uptime.seconds//60)%60}m"
-            
-            return f"""🌍 **WRLD Relief Disaster Agent Status**
-
-🟢 **Status**: Online and monitoring
-📊 **Total Disasters**: {len(disaster_cache)}
-🔍 **Searches Performed**: {search_count}
-⏰ **Uptime**: {uptime_str}
-🔄 **Last Data Update**: {datetime.fromtimestamp(last_update).strftime('%Y-%m-%d %H:%M:%S') if last_update else 'Never'}
-🆔 **Agent Address**: {agent.address}
-
-**I specialize in {subject_matter}.**
-
-**Available Commands:**
-• "Show me earthquakes in Japan"
-• "What disasters happened today?"
-• "Any floods in Bangladesh?"
-• "Tell me about recent wildfires"
+    ctx.logger.info("✅ Message acknowledged by %s", sender)
+
+# 분기 키워드 → 분기 종류 매핑 (한 번의 스캔으로 모든 분기 판정)
+_DISPATCH_KEYWORDS = {
+    'status': ('status', 'health', 'info', 'about', '상태', '정보'),
+    'disaster': (
+        'earthquake', 'flood', 'fire', 'disaster', 'emergency', 'crisis',
+        'japan', 'california', 'tsunami', 'hurricane', 'typhoon', 'volcano',
+        'conflict', 'war', 'attack', 'wildfire', 'flooding', 'seismic',
+        '지진', '홍수', '재해', '재난', '일본', '미국', '태풍', '산불', '분쟁'
+    ),
+    'help': ('help', 'how', 'what can', 'commands', '도움', '명령어'),
+}
+_KW_TO_KIND = {kw: kind for kind, kws in _DISPATCH_KEYWORDS.items() for kw in kws}
+# 긴 키워드 우선 교대 패턴: C 레벨 단일 선형 스캔 (Aho-Corasick 대체)
+_DISPATCH_RE = re.compile('|'.join(
+    map(re.escape, sorted(_KW_TO_KIND, key=len, reverse=True))
+))
+
+ERROR_TEXT = ("🚨 Sorry, I encountered an error processing your request. "
+              "Please try again or ask for 'help' to see available commands.")
+
+
+# 분기별 렌더러 — if/elif 사다리 대신 테이블에서 직접 호출
+def _status_handler(ctx: Context, text_lower: str) -> str:
+    """상태 확인 응답"""
+    return STATUS_TMPL.format(
+        n_disasters=len(disaster_cache),
+        n_searches=search_count,
+        uptime=_uptime_str(),
+        last_update=datetime.fromtimestamp(last_update).strftime('%Y-%m-%d %H:%M:%S') if last_update else 'Never',
+        address=agent.address
+    )
 
-Ready to help with global disaster monitoring! 🚨"""
-        
-        # 재해 검색 요청
-        elif any(keyword in text_lower for keyword in disaster_keywords):
-            disasters = search_disasters_by_query(text, 5)
-            
-            if disasters:
-                response_text = f"🚨 **Found {len(disasters)} disasters related to your query:**\n\n"
-                
-                for i, disaster in enumerate(disasters, 1):
-                    # 시간 포맷팅
-                    disaster_time = datetime.fromtimestamp(disaster['timestamp'])
-                    time_ago = datetime.now() - disaster_time
-                    
-                    if time_ago.days > 0:
-                        time_str = f"{time_ago.days} days ago"
-                    elif time_ago.seconds > 3600:
-                        time_str = f"{time_ago.seconds//3600} hours ago"
-                    else:
-                        time_str = f"{time_ago.seconds//60} minutes ago"
-                    
-                    # 심각도 이모지
-                    severity_emoji = {
-                        'CRITICAL': '🔴',
-                        'HIGH': '🟠', 
-                        'MEDIUM': '🟡',
-                        'LOW': '🟢'
-                    }.get(disaster['severity'], '⚪')
-                    
-                    response_text += f"**{i}. {disaster['title']}**\n"
-                    response_text += f"📍 **Location**: {disaster['location']}\n"
-                    response_text += f"{severity_emoji} **Severity**: {disaster['severity']}\n"
-                    response_text += f"📂 **Category**: {disaster['category']}\n"
-                    response_text += f"⏰ **Time**: {time_str}\n"
-                    response_text += f"📰 **Source**: {disaster['source']}\n"
-                    
-                    if disaster.get('affected_people', 0) > 0:
-                        response_text += f"👥 **Affected**: {disaster['affected_people']:,} people\n"
-                    
-                    response_text += f"📝 **Details**: {disaster['description']}\n\n"
-                
-                response_text += "💡 **Need more specific information?** Try asking about:\n"
-                response_text += "• Specific locations: 'earthquakes in Japan'\n"
-                response_text += "• Disaster types: 'recent floods'\n"
-                response_text += "• Severity levels: 'critical disasters today'"
-                
-                return response_text
-                
-            else:
-                return f"""🔍 **No disasters found for '{text}'**
 
-This could mean:
-• No recent disasters match your criteria
-• Try different keywords or locations
-• Check spelling of location names
+def _disaster_handler(ctx: Context, text_lower: str) -> str:
+    """재해 검색 응답 (같은 데이터 버전 안에서는 동일 쿼리 렌더링 재사용)
 
-**Suggestions:**
-• "earthquakes in Japan" 
-• "floods in Bangladesh"
-• "wildfires in California"
-• "recent disasters today"
-• "high severity emergencies"
+    검색/렌더링만 try로 좁게 감싼다 — 템플릿 분기들은 실패할 것이 없음.
+    """
+    try:
+        return _render_search(text_lower, data_version)
+    except Exception:
+        ctx.logger.exception("❌ Response generation error")
+        return ERROR_TEXT
 
-I'm monitoring {len(disaster_cache)} disasters globally! 🌍"""
-        
-        # 도움말 요청
-        elif any(word in text_lower for word in ['help', 'how', 'what can', 'commands', '도움', '명령어']):
-            return f"""🌍 **WRLD Relief Disaster Monitoring Agent**
 
-I'm an expert in **{subject_matter}**.
+def _help_handler(ctx: Context, text_lower: str) -> str:
+    """도움말 응답"""
+    return HELP_TEXT
 
-**🔍 What I can help with:**
-• 🌏 **Global disaster monitoring** - earthquakes, floods, wildfires, hurricanes
-• 📊 **Real-time updates** - latest disaster information from USGS and other sources  
-• 🗺️ **Location-based search** - disasters in specific countries/regions
-• ⚠️ **Severity assessment** - critical, high, medium, low severity levels
-• 📈 **Impact analysis** - affected population and damage estimates
 
-**💬 Example queries:**
-• "Show me recent earthquakes in Japan"
-• "What floods happened this week?"
-• "Any wildfires in California?"
-• "Tell me about critical disasters today"
-• "Disasters in Southeast Asia"
+def _offtopic_handler(ctx: Context, text_lower: str) -> str:
+    """전문 분야 외 질문 응답"""
+    return OFFTOPIC_TMPL.format(n_disasters=len(disaster_cache))
 
-**🌐 Data sources:**
-• USGS (earthquakes)
-• ReliefWeb (humanitarian crises)
-• Global disaster monitoring networks
 
-Ready to help you stay informed about global emergencies! 🚨"""
-        
-        # 전문 분야 외 질문
-        else:
-            return f"""👋 **Hello! I'm the WRLD Relief Disaster Monitoring Agent**
+# 여러 분기 키워드가 동시에 매칭될 때의 우선순위 (기존 if/elif 순서 유지)
+_KIND_PRIORITY = ('status', 'disaster', 'help')
+HANDLERS = {
+    'status': _status_handler,
+    'disaster': _disaster_handler,
+    'help': _help_handler,
+}
 
-I specialize in **{subject_matter}**.
 
-If you're asking about other topics, I politely say that I don't know about them as I focus specifically on disaster monitoring and emergency response.
+async def generate_disaster_response(ctx: Context, text: str) -> str:
+    """재해 관련 응답 생성"""
+    text_lower = text.lower()
 
-**🚨 Currently monitoring {len(disaster_cache)} disasters worldwide**
+    # 데이터 새로고침은 periodic_data_refresh가 전담
+    # (요청 경로에서 네트워크 갱신을 기다리지 않음)
 
-**Quick examples to try:**
-• "Show me earthquakes in Japan" 🗾
-• "What disasters happened today?" 📅  
-• "Any floods in Bangladesh?" 🌊
-• "Tell me about recent wildfires" 🔥
-• "Status" - for system information 📊
+    # 분기 판정: 키워드 목록별 any() 3회 대신 단일 스캔으로 종류 집합 구성
+    kinds = {_KW_TO_KIND[m] for m in _DISPATCH_RE.findall(text_lower)}
 
-I'm here 24/7 to help you stay informed about global emergencies and disasters. What would you like to know? 🌍"""
-        
-    except Exception as e:
-        ctx.logger.error(f"❌ Response generation error: {e}")
-        return "🚨 Sorry, I encountered an error processing your request. Please try again or ask for 'help' to see available commands."
+    kind = next((k for k in _KIND_PRIORITY if k in kinds), None)
+    return HANDLERS.get(kind, _offtopic_handler)(ctx, text_lower)
 
 # ============================================================================
 # 주기적 작업
 # ============================================================================
 
-@agent.on_interval(period=3600.0)  # 1시간마다
+# 고정 주기 대신 ±10% 지터: 다중 레플리카가 동시에 USGS를 때리는 것을 방지
+REFRESH_PERIOD = 3600.0
+HEALTH_PERIOD = 1800.0
+
+
 async def periodic_data_refresh(ctx: Context):
-    """주기적 데이터 새로고침"""
-    ctx.logger.info("🔄 Periodic data refresh starting...")
-    await refresh_disaster_data(ctx)
+    """주기적 데이터 새로고침 (지터 적용 루프)"""
+    while True:
+        await asyncio.sleep(REFRESH_PERIOD * random.uniform(0.9, 1.1))
+        ctx.logger.info("🔄 Periodic data refresh starting...")
+        await refresh_disaster_data(ctx)
+
 
-@agent.on_interval(period=1800.0)  # 30분마다
 async def periodic_health_check(ctx: Context):
-    """주기적 상태 체크"""
-    uptime = datetime.now() - start_time
-    ctx.logger.info(f"💓 Health check - Disasters: {len(disaster_cache)}, Searches: {search_count}, Uptime: {uptime}")
+    """주기적 상태 체크 (지터 적용 루프)"""
+    while True:
+        await asyncio.sleep(HEALTH_PERIOD * random.uniform(0.9, 1.1))
+        ctx.logger.info("💓 Health check - Disasters: %d, Searches: %d, Uptime: %s", len(disaster_cache), search_count, _uptime_str())
 
 # ============================================================================
 # Protocol 연결 및 에이전트 실행
@@ -4,23 +4,196 @@ Perplexity, OpenAI 등을 활용한 실시간 재해 검색 및 스마트 좌표
 """
 
 import aiohttp
+import asyncio
 import json
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import os
 import hashlib
+import random
 import re
 
 logger = logging.getLogger(__name__)
 
+# orjson(Rust 구현)이 있으면 사용, 없으면 표준 json으로 폴백
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+# 좌표는 사실상 불변 — 디스크 캐시 90일 유지
+_COORD_CACHE_TTL = 90 * 86400
+
+# 일시적 오류로 간주해 재시도하는 HTTP 상태
+_RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+# 스트리밍 LLM 호출용 타임아웃: 3000토큰 완성은 세션 기본 total=30s를
+# 정상 지연에서도 초과하므로 total 상한 없이 연결/청크 간 무응답만 제한
+_LLM_STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_read=30)
+
+# Perplexity가 이 시간(초) 안에 응답하지 않으면 OpenAI 헤지를 기동
+_HEDGE_DELAY = 2.0
+
+# 프롬프트 — 호출마다 멀티 KB 문자열을 재조립하지 않도록 모듈 수준 상수로 1회 정의
+_BATCH_PROMPT = """
+        최근 7일간 전 세계 주요 재해/분쟁 사건들을 검색해서 다음 JSON 형식으로 반환해주세요:
+
+        [
+            {
+                "title": "구체적 사건명",
+                "location": "정확한 도시명, 국가명",
+                "category": "카테고리코드",
+                "severity": "HIGH|MEDIUM|LOW",
+                "description": "간단한 설명 (1-2문장)",
+                "date": "2025-01-XX",
+                "source": "뉴스출처",
+                "affected_people": 숫자_또는_null,
+                "coordinates": {"lat": 위도, "lng": 경도}
+            }
+        ]
+
+        카테고리별 요청:
+        1. 자연재해: 지진(5.0+), 홍수, 허리케인, 화산, 산불 등
+        2. 분쟁/전쟁: 무력충돌, 테러공격, 폭격 등
+        3. 인도적위기: 난민, 기근, 전염병 등
+        4. 산업재해: 폭발, 화학유출, 건물붕괴 등
+        5. 기타재해: 사이버공격, 정치위기 등
+
+        조건:
+        - 최근 7일 내 실제 발생 사건만
+        - 도시 수준의 정확한 위치 필수
+        - 각 카테고리당 6-8개씩, 총 40개 사건
+        - 전 세계 고르게 분포 (아시아, 중동, 아프리카, 유럽, 아메리카)
+        - 실제 좌표 포함 (추정 가능)
+        """
+
+_QUERY_PROMPT = """
+        다음 키워드에 대한 최근 7일간 재해/분쟁 정보를 검색해주세요: "{query}"
+
+        JSON 형식으로 {max_results}개 결과:
+        [
+            {{
+                "title": "구체적 사건명",
+                "location": "도시명, 국가명",
+                "category": "적절한_카테고리",
+                "severity": "HIGH|MEDIUM|LOW",
+                "description": "간단한 설명",
+                "date": "2025-01-XX",
+                "source": "뉴스출처",
+                "affected_people": 숫자_또는_null,
+                "coordinates": {{"lat": 위도, "lng": 경도}}
+            }}
+        ]
+
+        조건: 최근 7일, 실제 사건만, 정확한 위치
+        """
+
+# 포괄적 카테고리 시스템 (30+ 카테고리)
+# 인스턴스마다 dict를 재생성하지 않도록 모듈 수준 불변 테이블로 공유
+_DISASTER_CATEGORIES = (
+    # 자연재해
+    ("EARTHQUAKE", ("earthquake", "quake", "seismic", "tremor", "magnitude")),
+    ("TSUNAMI", ("tsunami", "tidal wave", "sea wave")),
+    ("VOLCANO", ("volcano", "volcanic", "eruption", "lava", "ash")),
+    ("LANDSLIDE", ("landslide", "mudslide", "rockslide", "avalanche")),
+
+    # 기상재해
+    ("HURRICANE", ("hurricane", "typhoon", "cyclone", "tropical storm")),
+    ("TORNADO", ("tornado", "twister", "funnel cloud")),
+    ("FLOOD", ("flood", "flooding", "deluge", "inundation", "flash flood")),
+    ("DROUGHT", ("drought", "water shortage", "dry spell", "arid")),
+    ("WILDFIRE", ("wildfire", "forest fire", "bushfire", "blaze")),
+    ("BLIZZARD", ("blizzard", "snowstorm", "ice storm")),
+    ("HEATWAVE", ("heatwave", "extreme heat", "heat dome")),
+    ("COLDWAVE", ("cold wave", "freeze", "frost", "arctic blast")),
+
+    # 분쟁/전쟁
+    ("WAR", ("war", "warfare", "military operation", "invasion")),
+    ("ARMED_CONFLICT", ("armed conflict", "fighting", "battle", "combat")),
+    ("CIVIL_WAR", ("civil war", "internal conflict", "insurgency")),
+    ("BORDER_CONFLICT", ("border conflict", "territorial dispute")),
+
+    # 테러/폭력
+    ("TERRORISM", ("terrorism", "terrorist attack", "bomb", "bombing")),
+    ("SHOOTING", ("shooting", "gunfire", "gunman", "shooter", "mass shooting")),
+    ("HOSTAGE", ("hostage", "kidnapping", "abduction")),
+    ("ASSASSINATION", ("assassination", "targeted killing")),
+
+    # 인도적 위기
+    ("REFUGEE_CRISIS", ("refugee", "displaced", "asylum seeker", "migration")),
+    ("FAMINE", ("famine", "hunger", "starvation", "food crisis")),
+    ("EPIDEMIC", ("epidemic", "outbreak", "disease", "virus", "pandemic")),
+    ("DISPLACEMENT", ("displacement", "evacuation", "forced migration")),
+
+    # 산업/기술 재해
+    ("INDUSTRIAL_ACCIDENT", ("industrial accident", "factory explosion", "plant fire")),
+    ("CHEMICAL_LEAK", ("chemical leak", "toxic spill", "gas leak", "contamination")),
+    ("NUCLEAR_ACCIDENT", ("nuclear accident", "radiation leak", "reactor")),
+    ("OIL_SPILL", ("oil spill", "petroleum leak", "environmental disaster")),
+    ("BUILDING_COLLAPSE", ("building collapse", "structure collapse", "construction accident")),
+    ("BRIDGE_COLLAPSE", ("bridge collapse", "infrastructure failure")),
+    ("TRAIN_ACCIDENT", ("train accident", "railway crash", "derailment")),
+    ("PLANE_CRASH", ("plane crash", "aircraft crash", "aviation accident")),
+    ("SHIP_ACCIDENT", ("ship accident", "maritime disaster", "vessel sinking")),
+
+    # 사회/정치 위기
+    ("POLITICAL_CRISIS", ("political crisis", "government crisis", "constitutional crisis")),
+    ("COUP", ("coup", "military takeover", "overthrow", "putsch")),
+    ("PROTEST", ("protest", "demonstration", "rally", "march", "uprising")),
+    ("RIOT", ("riot", "unrest", "violence", "clashes", "civil disorder")),
+    ("ETHNIC_CONFLICT", ("ethnic conflict", "sectarian violence", "communal violence")),
+
+    # 기타
+    ("CYBER_ATTACK", ("cyber attack", "hacking", "data breach", "ransomware")),
+    ("INFRASTRUCTURE_FAILURE", ("power outage", "blackout", "grid failure")),
+    ("ECONOMIC_CRISIS", ("economic crisis", "financial collapse", "market crash")),
+)
+
+# 카테고리 키워드 전체를 단일 교대 패턴으로 import 시 1회 컴파일
+# (재해당 카테고리×키워드 파이썬 루프 대신 C 레벨 스캔 1회,
+#  긴 키워드 우선 정렬로 "flash flood"가 "flood"보다 먼저 매칭)
+# 키워드 → (카테고리, 가중치): 앞선 카테고리일수록 가중치가 높아
+# 기존 순차 탐색의 카테고리 우선순위가 그대로 유지된다
+_KEYWORD_META = {
+    keyword.lower(): (category, weight)
+    for weight, (category, keywords) in enumerate(reversed(_DISASTER_CATEGORIES), start=1)
+    for keyword in keywords
+}
+_CAT_RE = re.compile("|".join(
+    map(re.escape, sorted(_KEYWORD_META, key=len, reverse=True))
+))
+
 class AISearchAgent:
     """AI 기반 재해 검색 에이전트"""
     
     def __init__(self):
         self.perplexity_api_key = os.getenv("PERPLEXITY_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
-        
+
+        # 모든 API 호출이 공유하는 세션 (요청마다 TCP+TLS 핸드셰이크 방지)
+        # 이벤트 루프가 필요하므로 첫 async 호출에서 지연 생성
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # 좌표 보강 동시성 제한 — AI 추정은 10개 병렬,
+        # Nominatim은 정책상 1 req/s라 직렬화
+        self._enhance_sem = asyncio.Semaphore(10)
+        self._nominatim_sem = asyncio.Semaphore(1)
+
+        # 지오코딩/AI 좌표 추정 영구 캐시 (cache_manager와 같은 JSON 파일 방식)
+        # 키는 sha256(네임스페이스:위치), 값은 {"value": ..., "expires_at": ts}
+        self._cache_file = os.path.join("data", "geo_cache.json")
+        self._disk_cache: Optional[Dict] = None
+
+        # 프로세스 내 메모 — 한 배치 안의 중복 위치("Gaza", "Kyiv" 등)를
+        # 1회 조회로 합치고, 동시 중복 요청은 진행 중인 태스크를 공유
+        self._geo_cache: Dict[str, Optional[Dict]] = {}
+        self._geo_inflight: Dict[str, asyncio.Task] = {}
+
         # 7일 최적화된 검색 쿼리 (토큰 절약)
         self.search_queries = {
             "global": [
@@ -40,65 +213,141 @@ class AISearchAgent:
             ]
         }
         
-        # 포괄적 카테고리 시스템 (30+ 카테고리)
-        self.disaster_categories = {
-            # 자연재해
-            "EARTHQUAKE": ["earthquake", "quake", "seismic", "tremor", "magnitude"],
-            "TSUNAMI": ["tsunami", "tidal wave", "sea wave"],
-            "VOLCANO": ["volcano", "volcanic", "eruption", "lava", "ash"],
-            "LANDSLIDE": ["landslide", "mudslide", "rockslide", "avalanche"],
-            
-            # 기상재해
-            "HURRICANE": ["hurricane", "typhoon", "cyclone", "tropical storm"],
-            "TORNADO": ["tornado", "twister", "funnel cloud"],
-            "FLOOD": ["flood", "flooding", "deluge", "inundation", "flash flood"],
-            "DROUGHT": ["drought", "water shortage", "dry spell", "arid"],
-            "WILDFIRE": ["wildfire", "forest fire", "bushfire", "blaze"],
-            "BLIZZARD": ["blizzard", "snowstorm", "ice storm"],
-            "HEATWAVE": ["heatwave", "extreme heat", "heat dome"],
-            "COLDWAVE": ["cold wave", "freeze", "frost", "arctic blast"],
-            
-            # 분쟁/전쟁
-            "WAR": ["war", "warfare", "military operation", "invasion"],
-            "ARMED_CONFLICT": ["armed conflict", "fighting", "battle", "combat"],
-            "CIVIL_WAR": ["civil war", "internal conflict", "insurgency"],
-            "BORDER_CONFLICT": ["border conflict", "territorial dispute"],
-            
-            # 테러/폭력
-            "TERRORISM": ["terrorism", "terrorist attack", "bomb", "bombing"],
-            "SHOOTING": ["shooting", "gunfire", "gunman", "shooter", "mass shooting"],
-            "HOSTAGE": ["hostage", "kidnapping", "abduction"],
-            "ASSASSINATION": ["assassination", "targeted killing"],
-            
-            # 인도적 위기
-            "REFUGEE_CRISIS": ["refugee", "displaced", "asylum seeker", "migration"],
-            "FAMINE": ["famine", "hunger", "starvation", "food crisis"],
-            "EPIDEMIC": ["epidemic", "outbreak", "disease", "virus", "pandemic"],
-            "DISPLACEMENT": ["displacement", "evacuation", "forced migration"],
-            
-            # 산업/기술 재해
-            "INDUSTRIAL_ACCIDENT": ["industrial accident", "factory explosion", "plant fire"],
-            "CHEMICAL_LEAK": ["chemical leak", "toxic spill", "gas leak", "contamination"],
-            "NUCLEAR_ACCIDENT": ["nuclear accident", "radiation leak", "reactor"],
-            "OIL_SPILL": ["oil spill", "petroleum leak", "environmental disaster"],
-            "BUILDING_COLLAPSE": ["building collapse", "structure collapse", "construction accident"],
-            "BRIDGE_COLLAPSE": ["bridge collapse", "infrastructure failure"],
-            "TRAIN_ACCIDENT": ["train accident", "railway crash", "derailment"],
-            "PLANE_CRASH": ["plane crash", "aircraft crash", "aviation accident"],
-            "SHIP_ACCIDENT": ["ship accident", "maritime disaster", "vessel sinking"],
-            
-            # 사회/정치 위기
-            "POLITICAL_CRISIS": ["political crisis", "government crisis", "constitutional crisis"],
-            "COUP": ["coup", "military takeover", "overthrow", "putsch"],
-            "PROTEST": ["protest", "demonstration", "rally", "march", "uprising"],
-            "RIOT": ["riot", "unrest", "violence", "clashes", "civil disorder"],
-            "ETHNIC_CONFLICT": ["ethnic conflict", "sectarian violence", "communal violence"],
-            
-            # 기타
-            "CYBER_ATTACK": ["cyber attack", "hacking", "data breach", "ransomware"],
-            "INFRASTRUCTURE_FAILURE": ["power outage", "blackout", "grid failure"],
-            "ECONOMIC_CRISIS": ["economic crisis", "financial collapse", "market crash"]
-        }
+        # 모듈 수준 불변 테이블의 dict 뷰 (기존 속성 호환용)
+        self.disaster_categories = {cat: list(kws) for cat, kws in _DISASTER_CATEGORIES}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """공유 ClientSession 반환 (keep-alive + DNS 캐시로 연결 재사용)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+
+    async def close(self):
+        """공유 세션 정리 (앱 종료 시 호출)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            self._session = None
+
+    @staticmethod
+    def _cache_key(namespace: str, value: str) -> str:
+        """캐시 키 생성 (네임스페이스로 소스 구분)"""
+        return hashlib.sha256(f"{namespace}:{value}".encode()).hexdigest()
+
+    def _load_disk_cache(self) -> Dict:
+        """디스크 캐시 지연 로드 (첫 접근 시 1회)"""
+        if self._disk_cache is None:
+            try:
+                with open(self._cache_file, 'r', encoding='utf-8') as f:
+                    self._disk_cache = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._disk_cache = {}
+        return self._disk_cache
+
+    def _check_cache(self, key: str):
+        """TTL이 남은 캐시 항목 반환, 없으면 None"""
+        entry = self._load_disk_cache().get(key)
+        if entry and entry.get("expires_at", 0) > int(datetime.now().timestamp()):
+            return entry["value"]
+        return None
+
+    def _save_to_cache(self, key: str, value, ttl: int):
+        """캐시 항목 저장 후 파일에 기록"""
+        cache = self._load_disk_cache()
+        cache[key] = {"value": value, "expires_at": int(datetime.now().timestamp()) + ttl}
+        try:
+            os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
+            with open(self._cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except Exception as e:
+            logger.warning(f"Geo cache save failed: {e}")
+
+    async def _enhance_all(self, disasters: List[Dict]) -> List[Dict]:
+        """좌표 보강을 병렬 실행 (순차 await 대신 bounded gather)
+
+        40건 × ~300ms 지오코딩 RTT를 직렬로 기다리면 10초 이상 걸리므로
+        세마포어 한도 내에서 동시에 처리한다.
+        """
+        async def bounded(disaster: Dict) -> Dict:
+            async with self._enhance_sem:
+                return await self._enhance_with_coordinates(disaster)
+
+        # 1차: 모델 좌표 신뢰 + Nominatim 지오코딩 (병렬)
+        enhanced = list(await asyncio.gather(*(bounded(d) for d in disasters)))
+
+        # 2차: 여전히 좌표가 없는 위치들을 LLM 호출 1회로 일괄 추정
+        missing = [
+            d for d in enhanced
+            if not self._coords_valid(d.get('coordinates'))
+            and d.get('location') and d['location'] != 'Location TBD'
+        ]
+        if missing and self.openai_api_key:
+            try:
+                coords_map = await self._ai_estimate_coordinates_batch(
+                    sorted({d['location'] for d in missing})
+                )
+                for d in missing:
+                    d['coordinates'] = coords_map.get(d['location'], {"lat": 0.0, "lng": 0.0})
+            except Exception as e:
+                logger.warning(f"Batch AI coordinate estimation failed: {e}")
+
+        return enhanced
+
+    async def _llm_request_with_retry(self, url: str, headers: Dict, payload: Dict,
+                                      max_attempts: int = 3) -> str:
+        """스트리밍 LLM 호출 — 일시 오류(429/5xx, 네트워크)만 지수 백오프 재시도
+
+        성공 시 SSE 스트림에서 모은 본문 텍스트를 반환하고,
+        재시도가 소진되거나 영구 오류면 예외를 올려 호출자의
+        공급자 폴백(Perplexity→OpenAI)이 동작하게 한다.
+        """
+        session = await self._get_session()
+        for attempt in range(1, max_attempts + 1):
+            try:
+                async with session.post(url, headers=headers, json=payload,
+                                        timeout=_LLM_STREAM_TIMEOUT) as response:
+                    if response.status == 200:
+                        return await self._collect_stream(response)
+                    response.raise_for_status()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = getattr(e, 'status', None)
+                permanent = status is not None and status not in _RETRYABLE_STATUSES
+                if attempt >= max_attempts or permanent:
+                    raise
+                logger.warning(f"LLM API error ({e}), retry {attempt}/{max_attempts}")
+            # 지수 백오프 + 지터 (1~2s, 2~3s, ...)
+            await asyncio.sleep((2 ** (attempt - 1)) + random.uniform(0, 1))
+        raise RuntimeError(f"LLM request to {url} exhausted {max_attempts} attempts")
+
+    async def _collect_stream(self, response) -> str:
+        """SSE 스트림의 delta 토큰을 도착 즉시 수집해 전체 본문으로 합친다
+
+        전체 완성을 한 번에 기다리는 대신 청크 단위로 받아
+        3000토큰 응답을 버퍼 하나에 통째로 들고 있지 않는다.
+        """
+        parts = []
+        async for raw_line in response.content:
+            line = raw_line.strip()
+            if not line.startswith(b"data:"):
+                continue
+            payload = line[5:].strip()
+            if payload == b"[DONE]":
+                break
+            try:
+                chunk = _json_loads(payload)
+                token = chunk["choices"][0].get("delta", {}).get("content")
+                if token:
+                    parts.append(token)
+            except (ValueError, KeyError, IndexError):
+                continue
+        return "".join(parts)
 
     async def search_global_disasters_7days(self) -> List[Dict]:
         """7일치 글로벌 재해 검색 (토큰 최적화)"""
@@ -109,55 +358,60 @@ class AISearchAgent:
         return await self._search_with_ai(query, max_results)
 
     async def _batch_ai_search_optimized(self) -> List[Dict]:
-        """배치 처리로 토큰 효율성 극대화"""
-        
-        # 단일 프롬프트로 모든 카테고리 검색 (토큰 절약)
-        batch_prompt = f"""
-        최근 7일간 전 세계 주요 재해/분쟁 사건들을 검색해서 다음 JSON 형식으로 반환해주세요:
-        
-        [
-            {{
-                "title": "구체적 사건명",
-                "location": "정확한 도시명, 국가명",
-                "category": "카테고리코드",
-                "severity": "HIGH|MEDIUM|LOW",
-                "description": "간단한 설명 (1-2문장)",
-                "date": "2025-01-XX",
-                "source": "뉴스출처",
-                "affected_people": 숫자_또는_null,
-                "coordinates": {{"lat": 위도, "lng": 경도}}
-            }}
-        ]
-        
-        카테고리별 요청:
-        1. 자연재해: 지진(5.0+), 홍수, 허리케인, 화산, 산불 등
-        2. 분쟁/전쟁: 무력충돌, 테러공격, 폭격 등
-        3. 인도적위기: 난민, 기근, 전염병 등
-        4. 산업재해: 폭발, 화학유출, 건물붕괴 등
-        5. 기타재해: 사이버공격, 정치위기 등
-        
-        조건:
-        - 최근 7일 내 실제 발생 사건만
-        - 도시 수준의 정확한 위치 필수
-        - 각 카테고리당 6-8개씩, 총 40개 사건
-        - 전 세계 고르게 분포 (아시아, 중동, 아프리카, 유럽, 아메리카)
-        - 실제 좌표 포함 (추정 가능)
-        """
-        
+        """배치 처리로 토큰 효율성 극대화 (단일 프롬프트로 모든 카테고리 검색)"""
+
+        # 두 공급자가 모두 가능하면 지연 헤지로 꼬리 지연 단축
+        if self.perplexity_api_key and self.openai_api_key:
+            return await self._hedged_batch_search()
+
         # Perplexity 우선 시도 (실시간 검색 최강)
         if self.perplexity_api_key:
             try:
-                return await self._search_with_perplexity(batch_prompt)
+                return await self._search_with_perplexity(_BATCH_PROMPT)
             except Exception as e:
                 logger.warning(f"Perplexity search failed: {e}")
-        
+
         # OpenAI 대체
         if self.openai_api_key:
             try:
-                return await self._search_with_openai_batch(batch_prompt)
+                return await self._search_with_openai_batch(_BATCH_PROMPT)
             except Exception as e:
                 logger.warning(f"OpenAI search failed: {e}")
-        
+
+        return []
+
+    async def _hedged_batch_search(self) -> List[Dict]:
+        """Perplexity 우선 + 지연 헤지 — 2초 내 응답이 없으면 OpenAI도 기동
+
+        먼저 성공(비어 있지 않은 결과)한 쪽을 채택하고 진 태스크는 취소한다.
+        빠른 경로에서는 헤지가 아예 발사되지 않으므로 평균 토큰 비용은
+        그대로이고, 한쪽이 멈춘 꼬리 케이스만 min(두 지연)으로 줄어든다.
+        """
+        primary = asyncio.create_task(self._search_with_perplexity(_BATCH_PROMPT))
+        done, _ = await asyncio.wait({primary}, timeout=_HEDGE_DELAY)
+
+        if primary in done:
+            try:
+                return primary.result()
+            except Exception as e:
+                logger.warning(f"Perplexity search failed: {e}")
+                return await self._search_with_openai_batch(_BATCH_PROMPT)
+
+        # Perplexity가 느림 — OpenAI 헤지 기동, 먼저 끝나는 쪽 채택
+        hedge = asyncio.create_task(self._search_with_openai_batch(_BATCH_PROMPT))
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    result = task.result()
+                except Exception as e:
+                    logger.warning(f"Hedged search branch failed: {e}")
+                    continue
+                if result:
+                    for loser in pending:
+                        loser.cancel()
+                    return result
         return []
 
     async def _search_with_perplexity(self, prompt: str) -> List[Dict]:
@@ -172,32 +426,21 @@ class AISearchAgent:
             "model": "llama-3.1-sonar-large-128k-online",
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": 3000,
-            "temperature": 0.2
+            "temperature": 0.2,
+            "stream": True
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.perplexity.ai/chat/completions",
-                    headers=headers,
-                    json=data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content']
-                        disasters = self._parse_ai_response(content)
-                        
-                        # 좌표 보강
-                        enhanced_disasters = []
-                        for disaster in disasters:
-                            enhanced = await self._enhance_with_coordinates(disaster)
-                            enhanced_disasters.append(enhanced)
-                        
-                        logger.info(f"🤖 Perplexity: Found {len(enhanced_disasters)} disasters")
-                        return enhanced_disasters
-        except Exception as e:
-            logger.error(f"Perplexity API error: {e}")
-            raise
+        # 오류는 그대로 전파 — 호출자(_batch_ai_search_optimized / _search_with_ai)가
+        # 로깅과 공급자 폴백을 담당하므로 여기서 잡았다 다시 던지지 않는다
+        content = await self._llm_request_with_retry(
+            "https://api.perplexity.ai/chat/completions", headers, data)
+        disasters = self._parse_ai_response(content)
+
+        # 좌표 보강 (병렬)
+        enhanced_disasters = await self._enhance_all(disasters)
+
+        logger.info(f"🤖 Perplexity: Found {len(enhanced_disasters)} disasters")
+        return enhanced_disasters
 
     async def _search_with_openai_batch(self, prompt: str) -> List[Dict]:
         """OpenAI로 배치 검색"""
@@ -211,57 +454,26 @@ class AISearchAgent:
             "model": "gpt-4",
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": 3000,
-            "temperature": 0.2
+            "temperature": 0.2,
+            "stream": True
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content']
-                        disasters = self._parse_ai_response(content)
-                        
-                        # 좌표 보강
-                        enhanced_disasters = []
-                        for disaster in disasters:
-                            enhanced = await self._enhance_with_coordinates(disaster)
-                            enhanced_disasters.append(enhanced)
-                        
-                        logger.info(f"🤖 OpenAI: Found {len(enhanced_disasters)} disasters")
-                        return enhanced_disasters
-        except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            raise
+        # 오류는 호출자의 로깅/폴백에 맡긴다 (log-and-reraise 중복 제거)
+        content = await self._llm_request_with_retry(
+            "https://api.openai.com/v1/chat/completions", headers, data)
+        disasters = self._parse_ai_response(content)
+
+        # 좌표 보강 (병렬)
+        enhanced_disasters = await self._enhance_all(disasters)
+
+        logger.info(f"🤖 OpenAI: Found {len(enhanced_disasters)} disasters")
+        return enhanced_disasters
 
     async def _search_with_ai(self, query: str, max_results: int) -> List[Dict]:
         """단일 쿼리 AI 검색"""
-        
-        prompt = f"""
-        다음 키워드에 대한 최근 7일간 재해/분쟁 정보를 검색해주세요: "{query}"
-        
-        JSON 형식으로 {max_results}개 결과:
-        [
-            {{
-                "title": "구체적 사건명",
-                "location": "도시명, 국가명",
-                "category": "적절한_카테고리",
-                "severity": "HIGH|MEDIUM|LOW",
-                "description": "간단한 설명",
-                "date": "2025-01-XX",
-                "source": "뉴스출처",
-                "affected_people": 숫자_또는_null,
-                "coordinates": {{"lat": 위도, "lng": 경도}}
-            }}
-        ]
-        
-        조건: 최근 7일, 실제 사건만, 정확한 위치
-        """
-        
+
+        prompt = _QUERY_PROMPT.format(query=query, max_results=max_results)
+
         # Perplexity 우선
         if self.perplexity_api_key:
             try:
@@ -278,17 +490,34 @@ class AISearchAgent:
         
         return []
 
+    def _extract_json_array(self, content: str) -> Optional[list]:
+        """응답 본문에서 첫 번째 유효한 JSON 배열을 추출
+
+        find('[')/rfind(']') 슬라이스는 "I found disasters [in Asia]: [...]"
+        같은 서술형 텍스트의 대괄호에 걸려 파싱이 통째로 실패한다.
+        raw_decode를 '[' 위치마다 시도해 실제로 디코딩되는 배열을 찾는다.
+        """
+        decoder = json.JSONDecoder()
+        pos = content.find('[')
+        while pos != -1:
+            try:
+                parsed, _ = decoder.raw_decode(content, pos)
+                if isinstance(parsed, list):
+                    return parsed
+            except json.JSONDecodeError:
+                pass
+            pos = content.find('[', pos + 1)
+        return None
+
     def _parse_ai_response(self, content: str) -> List[Dict]:
         """AI 응답을 파싱해서 재해 데이터로 변환"""
         try:
             # JSON 추출
-            start = content.find('[')
-            end = content.rfind(']') + 1
-            if start != -1 and end != 0:
-                json_str = content[start:end]
-                disasters_data = json.loads(json_str)
-                
+            disasters_data = self._extract_json_array(content)
+            if disasters_data is not None:
                 # 데이터 정제 및 변환
+                # 기본 타임스탬프(1일 전)는 루프 밖에서 1회만 계산
+                default_ts = int((datetime.now() - timedelta(days=1)).timestamp())
                 processed_disasters = []
                 for item in disasters_data:
                     if isinstance(item, dict) and item.get('title'):
@@ -299,13 +528,13 @@ class AISearchAgent:
                         )
                         
                         disaster = {
-                            "id": f"ai_{hashlib.md5(item.get('title', '').encode()).hexdigest()[:8]}",
+                            "id": f"ai_{hashlib.blake2b(item.get('title', '').encode(), digest_size=4).hexdigest()}",
                             "title": item.get('title', 'Unknown Disaster'),
                             "description": item.get('description', ''),
                             "location": item.get('location', 'Location TBD'),
                             "severity": item.get('severity', 'MEDIUM'),
                             "category": category,
-                            "timestamp": self._parse_ai_timestamp(item.get('date')),
+                            "timestamp": self._parse_ai_timestamp(item.get('date'), default_ts),
                             "source": f"AI-{item.get('source', 'Search')}",
                             "confidence": 0.8,
                             "affected_people": item.get('affected_people'),
@@ -325,62 +554,95 @@ class AISearchAgent:
     def _categorize_disaster_ai(self, title: str, description: str) -> str:
         """AI 응답의 재해를 정확한 카테고리로 분류"""
         text = (title + " " + description).lower()
-        
-        # 키워드 매칭으로 카테고리 결정
-        for category, keywords in self.disaster_categories.items():
-            if any(keyword in text for keyword in keywords):
-                return category
-        
-        return "OTHER"
 
-    def _parse_ai_timestamp(self, date_str: str) -> int:
-        """AI 응답의 날짜를 타임스탬프로 변환"""
+        # 키워드 매칭으로 카테고리 결정 (컴파일된 교대 패턴 단일 스캔,
+        # 가중치 max로 카테고리 테이블 선언 순서의 우선순위 유지)
+        matches = _CAT_RE.findall(text)
+        if not matches:
+            return "OTHER"
+        category, _ = max((_KEYWORD_META[m] for m in set(matches)), key=lambda meta: meta[1])
+        return category
+
+    def _parse_ai_timestamp(self, date_str: Optional[str], default_ts: int) -> int:
+        """AI 응답의 날짜를 타임스탬프로 변환 (실패 시 호출자가 준 기본값)"""
         try:
-            if date_str:
-                # 다양한 날짜 형식 처리
-                if "2025-" in date_str:
-                    dt = datetime.strptime(date_str, "%Y-%m-%d")
-                    return int(dt.timestamp())
-        except:
-            pass
-        
-        # 기본값: 1일 전
-        return int((datetime.now() - timedelta(days=1)).timestamp())
+            # fromisoformat은 C 구현이며 연도 하드코딩 없이 ISO 날짜를 처리
+            return int(datetime.fromisoformat(date_str).timestamp())
+        except (TypeError, ValueError):
+            return default_ts
+
+    @staticmethod
+    def _coords_valid(coords: Optional[Dict]) -> bool:
+        """좌표 유효성 검사: 범위 내이고 (0,0) 플레이스홀더가 아님"""
+        if not coords:
+            return False
+        lat = coords.get('lat', 0)
+        lng = coords.get('lng', 0)
+        return -90 <= lat <= 90 and -180 <= lng <= 180 and (lat, lng) != (0, 0)
 
     async def _enhance_with_coordinates(self, disaster: Dict) -> Dict:
         """재해 데이터에 정확한 좌표 추가"""
-        
-        # 이미 좌표가 있고 유효하면 그대로 사용
-        coords = disaster.get('coordinates', {})
-        if coords and coords.get('lat', 0) != 0 and coords.get('lng', 0) != 0:
+
+        # 이미 좌표가 있고 유효하면 그대로 사용 (HTTP 왕복 전부 생략)
+        if self._coords_valid(disaster.get('coordinates')):
             return disaster
-        
+
         # 위치 기반으로 좌표 획득
         location = disaster.get('location', '')
         if location and location != 'Location TBD':
             try:
                 # OpenStreetMap Nominatim으로 지오코딩
                 precise_coords = await self._geocode_location(location)
-                if precise_coords:
+                if self._coords_valid(precise_coords):
                     disaster['coordinates'] = precise_coords
                     return disaster
             except Exception as e:
                 logger.warning(f"Geocoding failed for {location}: {e}")
-        
-        # AI로 좌표 추정 (최후 수단)
-        if self.openai_api_key:
-            try:
-                estimated_coords = await self._ai_estimate_coordinates(location)
-                disaster['coordinates'] = estimated_coords
-            except Exception as e:
-                logger.warning(f"AI coordinate estimation failed: {e}")
-                disaster['coordinates'] = {"lat": 0.0, "lng": 0.0}
-        
+
+        # AI 좌표 추정은 _enhance_all이 배치로 일괄 처리 (건당 호출 금지)
         return disaster
 
+    async def _dedup_lookup(self, key: str, factory):
+        """같은 키의 중복 조회를 1회 네트워크 호출로 합치는 메모 헬퍼
+
+        완료된 결과는 self._geo_cache에서, 진행 중인 조회는
+        self._geo_inflight의 태스크를 공유해 N개의 동시 중복 요청이
+        병렬 N회가 아닌 1회 호출로 끝난다.
+        """
+        if key in self._geo_cache:
+            return self._geo_cache[key]
+
+        task = self._geo_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._geo_inflight[key] = task
+
+        try:
+            result = await task
+        finally:
+            self._geo_inflight.pop(key, None)
+
+        self._geo_cache[key] = result
+        return result
+
     async def _geocode_location(self, location: str) -> Optional[Dict[str, float]]:
-        """OpenStreetMap으로 무료 지오코딩"""
-        
+        """지오코딩 (프로세스 내 메모 + 동시 중복 합치기)"""
+        key = "geo:" + location.lower().strip()
+        return await self._dedup_lookup(key, lambda: self._geocode_location_uncached(location))
+
+    async def _ai_estimate_coordinates(self, location: str) -> Dict[str, float]:
+        """AI 좌표 추정 (프로세스 내 메모 + 동시 중복 합치기)"""
+        key = "ai:" + location.lower().strip()
+        return await self._dedup_lookup(key, lambda: self._ai_estimate_coordinates_uncached(location))
+
+    async def _geocode_location_uncached(self, location: str) -> Optional[Dict[str, float]]:
+        """OpenStreetMap으로 무료 지오코딩 (디스크 캐시 우선)"""
+
+        cache_key = self._cache_key("nominatim", location)
+        cached = self._check_cache(cache_key)
+        if cached is not None:
+            return cached
+
         url = "https://nominatim.openstreetmap.org/search"
         params = {
             "q": location,
@@ -394,23 +656,103 @@ class AISearchAgent:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
+            session = await self._get_session()
+            # Nominatim 이용 정책: 최대 1 req/s — 직렬화 + 호출 간 1초 간격
+            async with self._nominatim_sem:
                 async with session.get(url, params=params, headers=headers) as response:
                     if response.status == 200:
                         data = await response.json()
-                        if data:
-                            return {
-                                "lat": float(data[0]["lat"]),
-                                "lng": float(data[0]["lon"])
-                            }
-        except Exception as e:
+                    else:
+                        data = None
+                await asyncio.sleep(1)
+            if data:
+                coords = {
+                    "lat": float(data[0]["lat"]),
+                    "lng": float(data[0]["lon"])
+                }
+                self._save_to_cache(cache_key, coords, _COORD_CACHE_TTL)
+                return coords
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError, IndexError) as e:
             logger.warning(f"Nominatim geocoding failed: {e}")
         
         return None
 
-    async def _ai_estimate_coordinates(self, location: str) -> Dict[str, float]:
-        """AI로 좌표 추정"""
-        
+    async def _ai_estimate_coordinates_batch(self, locations: List[str]) -> Dict[str, Dict[str, float]]:
+        """여러 위치의 좌표를 LLM 호출 1회로 일괄 추정
+
+        위치당 HTTP 왕복 1회 대신 번호 매긴 목록을 한 프롬프트로 보내고
+        JSON 배열을 돌려받는다. 디스크 캐시에 있는 위치는 요청에서 제외.
+        """
+        results: Dict[str, Dict[str, float]] = {}
+        remaining = []
+        for location in locations:
+            cached = self._check_cache(self._cache_key("ai_coord", location))
+            if cached is not None:
+                results[location] = cached
+            else:
+                remaining.append(location)
+
+        if not remaining or not self.openai_api_key:
+            return results
+
+        numbered = "\n".join(f"{i}. {loc}" for i, loc in enumerate(remaining, 1))
+        prompt = f"""
+        다음 위치들의 정확한 위도(latitude)와 경도(longitude)를 알려주세요:
+        {numbered}
+
+        다음 JSON 배열 형식으로만, 입력과 같은 순서로 답변하세요:
+        [{{"name": "위치명", "lat": 위도숫자, "lng": 경도숫자}}]
+        """
+
+        headers = {
+            "Authorization": f"Bearer {self.openai_api_key}",
+            "Content-Type": "application/json"
+        }
+
+        data = {
+            "model": "gpt-3.5-turbo",
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": 60 * len(remaining),
+            "temperature": 0.1
+        }
+
+        try:
+            session = await self._get_session()
+            async with session.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers=headers,
+                json=data
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    content = result['choices'][0]['message']['content']
+
+                    items = self._extract_json_array(content) or []
+                    for idx, item in enumerate(items):
+                        if not isinstance(item, dict):
+                            continue
+                        # 모델이 위치명을 바꿔 쓸 수 있으므로 순서 기반 매칭을 우선
+                        name = remaining[idx] if idx < len(remaining) else item.get('name', '')
+                        try:
+                            coords = {"lat": float(item["lat"]), "lng": float(item["lng"])}
+                        except (KeyError, TypeError, ValueError):
+                            continue
+                        if self._coords_valid(coords):
+                            results[name] = coords
+                            self._save_to_cache(self._cache_key("ai_coord", name), coords, _COORD_CACHE_TTL)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError, IndexError) as e:
+            logger.error(f"Batch AI coordinate estimation failed: {e}")
+
+        return results
+
+    async def _ai_estimate_coordinates_uncached(self, location: str) -> Dict[str, float]:
+        """AI로 좌표 추정 (디스크 캐시 우선 — 캐시 히트 시 LLM 호출 생략)"""
+
+        cache_key = self._cache_key("ai_coord", location)
+        cached = self._check_cache(cache_key)
+        if cached is not None:
+            return cached
+
         prompt = f"""
         다음 위치의 정확한 위도(latitude)와 경도(longitude)를 알려주세요:
         위치: {location}
@@ -437,23 +779,25 @@ class AISearchAgent:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=data
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content']
-                        
-                        # JSON 파싱
-                        coords_data = json.loads(content.strip())
-                        return {
-                            "lat": float(coords_data["lat"]),
-                            "lng": float(coords_data["lng"])
-                        }
-        except Exception as e:
+            session = await self._get_session()
+            async with session.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers=headers,
+                json=data
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
+                    content = result['choices'][0]['message']['content']
+
+                    # JSON 파싱
+                    coords_data = _json_loads(content.strip())
+                    coords = {
+                        "lat": float(coords_data["lat"]),
+                        "lng": float(coords_data["lng"])
+                    }
+                    self._save_to_cache(cache_key, coords, _COORD_CACHE_TTL)
+                    return coords
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, TypeError, KeyError, IndexError) as e:
             logger.error(f"AI coordinate estimation failed: {e}")
         
         return {"lat": 0.0, "lng": 0.0}
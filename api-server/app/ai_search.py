@@ -20,6 +20,26 @@ from data_quality import DataQualityEnhancer
 
 logger = logging.getLogger(__name__)
 
+# Use orjson (Rust implementation) when available, stdlib json otherwise
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    def _json_loads(data):
+        return json.loads(data)
+
+def _short_id(data: bytes) -> str:
+    """8-hex-char content ID; blake2b computes just the 4 bytes we keep"""
+    return hashlib.blake2b(data, digest_size=4).hexdigest()
+
+# Per-request overrides for upstreams slower than the shared session's
+# 15s default: ReliefWeb/GDACS keep their original 30s budget and the
+# non-streaming OpenAI completion gets room for a 2000-token response
+_SLOW_FEED_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5)
+_OPENAI_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=10)
+
 @dataclass
 class DisasterInfo:
     """Disaster information data class"""
@@ -38,7 +58,13 @@ class DisasterInfo:
 
 class DisasterSearchEngine:
     """AI-powered global disaster search engine"""
-    
+
+    # Time budgets (seconds): quick feed sources, the slower LLM source,
+    # and the grace added to the largest budget for the overall bound
+    PER_SOURCE_TIMEOUT = 20
+    AI_SOURCE_TIMEOUT = 60
+    GATHER_GRACE = 10
+
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.perplexity_api_key = os.getenv("PERPLEXITY_API_KEY")
@@ -114,13 +140,138 @@ class DisasterSearchEngine:
             "ukraine", "russia", "syria", "gaza", "israel", "palestine",
             "yemen", "afghanistan", "iraq", "sudan", "myanmar", "ethiopia"
         ]
-        
-        # Enhanced location patterns
-        self.location_patterns = [
+
+        # Single compiled alternation scans a text once instead of ~70 substring
+        # checks; no word boundaries so substring matches ("earthquakes",
+        # "wildfires") behave like the original `keyword in text` checks
+        self._kw_regex = re.compile(
+            '|'.join(map(re.escape, sorted(self.disaster_keywords, key=len, reverse=True))),
+            re.IGNORECASE
+        )
+
+        # Keyword -> (category, weight); higher weight wins so the table
+        # reproduces the old first-match category priority in one pass
+        category_keywords = [
+            ("EARTHQUAKE", ["earthquake", "quake", "seismic", "tremor"]),
+            ("WILDFIRE", ["fire", "wildfire", "blaze", "burn"]),
+            ("FLOOD", ["flood", "flooding", "deluge", "inundation"]),
+            ("HURRICANE", ["hurricane", "typhoon", "cyclone", "storm"]),
+            ("VOLCANO", ["volcano", "volcanic", "eruption", "lava"]),
+            ("TORNADO", ["tornado", "twister"]),
+            ("DROUGHT", ["drought", "dry", "water shortage"]),
+        ]
+        self._kw_meta: Dict[str, tuple] = {}
+        for weight, (category, keywords) in enumerate(reversed(category_keywords), start=1):
+            for kw in keywords:
+                self._kw_meta[kw] = (category, weight)
+        # No word boundaries: the original substring semantics are kept
+        # (e.g. "burn" still matches inside "burning")
+        self._cat_re = re.compile('|'.join(map(re.escape, sorted(self._kw_meta, key=len, reverse=True))))
+
+        # Severity word -> rank, resolved with one scan and a max()
+        self._sev_meta = {}
+        for rank, words in (
+            (3, ["catastrophic", "devastating", "major", "massive", "deadly", "fatal"]),
+            (2, ["severe", "significant", "serious", "dangerous", "critical"]),
+            (1, ["moderate", "considerable", "notable"]),
+        ):
+            for word in words:
+                self._sev_meta[word] = rank
+        self._sev_re = re.compile('|'.join(map(re.escape, sorted(self._sev_meta, key=len, reverse=True))))
+
+        # Enhanced location patterns (compiled once; matched per RSS entry)
+        self.location_patterns = [re.compile(p) for p in [
             r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\b',  # City, Country
             r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:in|near)\s+([A-Z][a-z]+)\b',  # Location in Country
             r'\b([A-Z][a-z]+)\s+(?:state|province|region)\b',  # State/Province
+        ]]
+
+        # Shared HTTP session (lazy) - reuses connections/TLS across all fetchers
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Conditional-request cache: URL -> (etag, last_modified, parsed list).
+        # On 304 Not Modified the cached parse is reused, skipping body + parse.
+        self._http_cache: Dict[str, tuple] = {}
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=8,
+                    ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+            )
+        return self._session
+
+    async def _gather_bounded(self, coros, budgets=None) -> List:
+        """Run source coroutines concurrently with per-source and overall time bounds
+
+        Each source gets its budget (PER_SOURCE_TIMEOUT unless overridden,
+        e.g. AI_SOURCE_TIMEOUT for the LLM source); the whole fan-out is
+        capped at the largest budget plus GATHER_GRACE so one stuck
+        upstream can't hang the load. Sources still pending at the
+        deadline are cancelled and partial results from the finished ones
+        are returned.
+        """
+        if budgets is None:
+            budgets = [self.PER_SOURCE_TIMEOUT] * len(coros)
+        tasks = [
+            asyncio.ensure_future(asyncio.wait_for(coro, budget))
+            for coro, budget in zip(coros, budgets)
         ]
+        done, pending = await asyncio.wait(tasks, timeout=max(budgets) + self.GATHER_GRACE)
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"⏱️ {len(pending)} data sources timed out, returning partial results")
+
+        results = []
+        for task in done:
+            exc = task.exception()
+            results.append(exc if exc is not None else task.result())
+        return results
+
+    async def close(self):
+        """Close the shared HTTP session (call on application shutdown)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    def _conditional_headers(self, url: str, extra: Optional[Dict] = None) -> Dict:
+        """Build request headers with If-None-Match/If-Modified-Since when cached"""
+        headers = dict(extra) if extra else {}
+        cached = self._http_cache.get(url)
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def _cached_parse(self, url: str) -> List:
+        """Return the parsed list cached for a URL that answered 304"""
+        return self._http_cache[url][2]
+
+    def _store_http_cache(self, url: str, response, parsed: List):
+        """Remember validators + parsed result so the next fetch can send conditionals"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._http_cache[url] = (etag, last_modified, parsed)
+
+    @staticmethod
+    async def _json(response):
+        """Decode a JSON response body with the fastest available parser"""
+        return _json_loads(await response.read())
+
+    async def _parse_feed_async(self, content: str):
+        """Run feedparser.parse in a thread so XML parsing doesn't block the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, feedparser.parse, content)
 
     async def get_initial_disasters(self, days: int = 30) -> List[DisasterInfo]:
         """Get initial disaster data for the last N days"""
@@ -135,12 +286,15 @@ class DisasterSearchEngine:
                 self._get_week_news_disasters(),
             ]
             
+            budgets = [self.PER_SOURCE_TIMEOUT] * len(tasks)
+
             # Add AI search if API key available
             if self.openai_api_key:
                 tasks.append(self._get_ai_week_disasters(days))
-            
-            # Collect all results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                budgets.append(self.AI_SOURCE_TIMEOUT)
+
+            # Collect all results (bounded so one stuck source can't hang the load)
+            results = await self._gather_bounded(tasks, budgets)
             
             # Combine results
             all_disasters = []
@@ -184,12 +338,15 @@ class DisasterSearchEngine:
                 self._search_news_feeds(query),
             ]
             
+            budgets = [self.PER_SOURCE_TIMEOUT] * len(tasks)
+
             # Add AI search if available
             if self.openai_api_key:
                 tasks.append(self._search_with_openai(query))
-            
-            # Collect results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                budgets.append(self.AI_SOURCE_TIMEOUT)
+
+            # Collect results (bounded so one stuck source can't hang the search)
+            results = await self._gather_bounded(tasks, budgets)
             
             # Combine and process
             all_disasters = []
@@ -216,94 +373,119 @@ class DisasterSearchEngine:
     async def _get_usgs_week_earthquakes(self) -> List[DisasterInfo]:
         """Get earthquakes from USGS for the past week"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.usgs_apis["week"]) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        earthquakes = []
-                        
-                        for feature in data.get('features', []):
-                            props = feature.get('properties', {})
-                            coords = feature.get('geometry', {}).get('coordinates', [])
-                            
-                            if len(coords) >= 2:
-                                # Clean location name
-                                place = props.get('place', '')
-                                location = self._clean_location(place) if place else f"Lat: {coords[1]:.2f}, Lon: {coords[0]:.2f}"
-                                
-                                earthquake = DisasterInfo(
-                                    id=f"usgs_{props.get('ids', hashlib.md5(str(props).encode()).hexdigest()[:8])}",
-                                    title=f"Magnitude {props.get('mag', 'Unknown')} Earthquake",
-                                    description=props.get('title', 'Earthquake detected by USGS monitoring network'),
-                                    location=location,
-                                    severity=self._get_earthquake_severity(props.get('mag', 0)),
-                                    category="EARTHQUAKE",
-                                    timestamp=int(props.get('time', 0) / 1000),
-                                    source="USGS",
-                                    confidence=0.95,
-                                    affected_people=self._estimate_affected_people(props.get('mag', 0)),
-                                    coordinates={"lat": coords[1], "lng": coords[0]} if len(coords) >= 2 else None
-                                )
-                                earthquakes.append(earthquake)
-                        
-                        logger.info(f"📊 USGS: Found {len(earthquakes)} earthquakes (week)")
-                        return earthquakes
-                        
+            session = await self._get_session()
+            async with session.get(self.usgs_apis["week"]) as response:
+                if response.status == 200:
+                    data = await self._json(response)
+                    earthquakes = []
+
+                    for feature in data.get('features', []):
+                        props = feature.get('properties', {})
+                        coords = feature.get('geometry', {}).get('coordinates', [])
+
+                        if len(coords) >= 2:
+                            # Clean location name
+                            place = props.get('place', '')
+                            location = self._clean_location(place) if place else f"Lat: {coords[1]:.2f}, Lon: {coords[0]:.2f}"
+
+                            earthquake = DisasterInfo(
+                                id=f"usgs_{props.get('ids') or _short_id((props.get('code') or props.get('title', '')).encode())}",
+                                title=f"Magnitude {props.get('mag', 'Unknown')} Earthquake",
+                                description=props.get('title', 'Earthquake detected by USGS monitoring network'),
+                                location=location,
+                                severity=self._get_earthquake_severity(props.get('mag', 0)),
+                                category="EARTHQUAKE",
+                                timestamp=int(props.get('time', 0) / 1000),
+                                source="USGS",
+                                confidence=0.95,
+                                affected_people=self._estimate_affected_people(props.get('mag', 0)),
+                                coordinates={"lat": coords[1], "lng": coords[0]} if len(coords) >= 2 else None
+                            )
+                            earthquakes.append(earthquake)
+
+                    logger.info(f"📊 USGS: Found {len(earthquakes)} earthquakes (week)")
+                    return earthquakes
+
         except Exception as e:
             logger.warning(f"USGS week search failed: {e}")
             return []
 
     async def _get_week_news_disasters(self) -> List[DisasterInfo]:
-        """Get disaster news from RSS feeds for the past week"""
+        """Get disaster news from RSS feeds for the past week (all feeds fetched concurrently)"""
+        session = await self._get_session()
+        week_ago = datetime.now() - timedelta(days=7)
+
+        # Shared across feeds so the same story from BBC/CNN/Reuters is
+        # rejected before any severity/location/coordinate work
+        seen: set = set()
+
+        tasks = [self._fetch_one_news_feed(session, url, week_ago, seen) for url in self.news_feeds]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
         disasters = []
-        
-        for feed_url in self.news_feeds:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(feed_url) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            feed = feedparser.parse(content)
-                            
-                            # Check more entries for week data
-                            for entry in feed.entries[:20]:  # Check more entries
-                                full_text = entry.title + " " + entry.get('summary', '')
-                                
-                                # Use enhanced disaster filtering
-                                if self.quality_enhancer.is_actual_disaster(entry.title, entry.get('summary', '')):
-                                    # Parse entry date
-                                    entry_time = self._parse_entry_time(entry)
-                                    
-                                    # Only include if within last week
-                                    week_ago = datetime.now() - timedelta(days=7)
-                                    if entry_time >= week_ago:
-                                        # Create disaster with enhanced location and coordinates
-                                        raw_location = self._extract_location_enhanced(full_text)
-                                        cleaned_location = self.quality_enhancer.clean_location(raw_location)
-                                        coordinates = self.quality_enhancer.get_coordinates(cleaned_location)
-                                        
-                                        disaster = DisasterInfo(
-                                            id=f"news_{hashlib.md5(entry.link.encode()).hexdigest()[:8]}",
-                                            title=entry.title,
-                                            description=self._clean_description(entry.get('summary', entry.title)),
-                                            location=cleaned_location,
-                                            severity=self._analyze_severity(full_text),
-                                            category=self._categorize_disaster(full_text),
-                                            timestamp=int(entry_time.timestamp()),
-                                            source=f"News-{feed.feed.get('title', 'Unknown')}",
-                                            confidence=0.75,
-                                            affected_people=self._estimate_people_from_text(full_text),
-                                            coordinates=coordinates
-                                        )
-                                        disasters.append(disaster)
-                            
-            except Exception as e:
-                logger.warning(f"News feed {feed_url} failed: {e}")
-                continue
-        
+        for feed_url, result in zip(self.news_feeds, results):
+            if isinstance(result, list):
+                disasters.extend(result)
+            elif isinstance(result, Exception):
+                logger.warning(f"News feed {feed_url} failed: {result}")
+
         logger.info(f"📰 News: Found {len(disasters)} disaster news (week)")
         return disasters
 
+    async def _fetch_one_news_feed(self, session, feed_url: str, week_ago: datetime,
+                                   seen: set) -> List[DisasterInfo]:
+        """Fetch and parse a single RSS feed into disaster entries"""
+        disasters = []
+
+        async with session.get(feed_url, headers=self._conditional_headers(feed_url)) as response:
+            if response.status == 304:
+                return self._cached_parse(feed_url)
+            if response.status != 200:
+                return disasters
+            content = await response.text()
+
+        feed = await self._parse_feed_async(content)
+
+        # Check more entries for week data
+        for entry in feed.entries[:20]:  # Check more entries
+            # Cross-feed duplicate check before any heavy per-entry work
+            key = _short_id((entry.title.strip().lower() + '|' + entry.link).encode())
+            if key in seen:
+                continue
+            seen.add(key)
+
+            full_text = entry.title + " " + entry.get('summary', '')
+
+            # Use enhanced disaster filtering
+            if self.quality_enhancer.is_actual_disaster(entry.title, entry.get('summary', '')):
+                # Parse entry date
+                entry_time = self._parse_entry_time(entry)
+
+                # Only include if within last week
+                if entry_time >= week_ago:
+                    # Create disaster with enhanced location and coordinates
+                    raw_location = self._extract_location_enhanced(full_text)
+                    cleaned_location = self.quality_enhancer.clean_location(raw_location)
+                    coordinates = self.quality_enhancer.get_coordinates(cleaned_location)
+
+                    disaster = DisasterInfo(
+                        id=f"news_{_short_id(entry.link.encode())}",
+                        title=entry.title,
+                        description=self._clean_description(entry.get('summary', entry.title)),
+                        location=cleaned_location,
+                        severity=self._analyze_severity(full_text),
+                        category=self._categorize_disaster(full_text),
+                        timestamp=int(entry_time.timestamp()),
+                        source=f"News-{feed.feed.get('title', 'Unknown')}",
+                        confidence=0.75,
+                        affected_people=self._estimate_people_from_text(full_text),
+                        coordinates=coordinates
+                    )
+                    disasters.append(disaster)
+
+        self._store_http_cache(feed_url, response, disasters)
+        return disasters
+
     async def _get_ai_week_disasters(self, days: int = 7) -> List[DisasterInfo]:
         """Get disasters from AI analysis for the past week"""
         if not self.openai_api_key:
@@ -338,58 +520,60 @@ class DisasterSearchEngine:
             - Maximum 15 disasters
             """
             
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.openai_api_key}",
-                    "Content-Type": "application/json"
-                }
-                
-                data = {
-                    "model": "gpt-3.5-turbo",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 2000,
-                    "temperature": 0.2
-                }
-                
-                async with session.post("https://api.openai.com/v1/chat/completions", 
-                                      headers=headers, json=data) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        content = result['choices'][0]['message']['content']
-                        
-                        # Extract JSON from response
-                        try:
-                            # Find JSON array in response
-                            start = content.find('[')
-                            end = content.rfind(']') + 1
-                            if start != -1 and end != 0:
-                                json_str = content[start:end]
-                                disasters_data = json.loads(json_str)
-                                
-                                disasters = []
-                                for item in disasters_data:
-                                    disaster = DisasterInfo(
-                                        id=f"ai_{hashlib.md5(item.get('title', '').encode()).hexdigest()[:8]}",
-                                        title=item.get('title', 'Unknown Disaster'),
-                                        description=item.get('description', ''),
-                                        location=item.get('location', 'Location TBD'),
-                                        severity=item.get('severity', 'MEDIUM'),
-                                        category=item.get('category', 'OTHER'),
-                                        timestamp=int(datetime.now().timestamp()) - (24 * 3600),  # Assume 1 day ago
-                                        source=f"AI-{item.get('source', 'Analysis')}",
-                                        confidence=item.get('confidence', 0.8),
-                                        affected_people=item.get('affected_people'),
-                                        damage_estimate=item.get('damage_estimate'),
-                                        coordinates=item.get('coordinates')
-                                    )
-                                    disasters.append(disaster)
-                                
-                                logger.info(f"🤖 OpenAI: Found {len(disasters)} disasters (week)")
-                                return disasters
-                                
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"OpenAI JSON parsing failed: {e}")
-                            
+            session = await self._get_session()
+            headers = {
+                "Authorization": f"Bearer {self.openai_api_key}",
+                "Content-Type": "application/json"
+            }
+
+            data = {
+                "model": "gpt-3.5-turbo",
+                "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": 2000,
+                "temperature": 0.2
+            }
+
+            async with session.post("https://api.openai.com/v1/chat/completions",
+                                    headers=headers, json=data,
+                                    timeout=_OPENAI_TIMEOUT) as response:
+                if response.status == 200:
+                    result = await self._json(response)
+                    content = result['choices'][0]['message']['content']
+
+                    # Extract JSON from response
+                    try:
+                        # Find JSON array in response
+                        start = content.find('[')
+                        end = content.rfind(']') + 1
+                        if start != -1 and end != 0:
+                            json_str = content[start:end]
+                            disasters_data = _json_loads(json_str)
+
+                            disasters = []
+                            default_ts = int(datetime.now().timestamp()) - (24 * 3600)  # Assume 1 day ago
+                            for item in disasters_data:
+                                disaster = DisasterInfo(
+                                    id=f"ai_{_short_id(item.get('title', '').encode())}",
+                                    title=item.get('title', 'Unknown Disaster'),
+                                    description=item.get('description', ''),
+                                    location=item.get('location', 'Location TBD'),
+                                    severity=item.get('severity', 'MEDIUM'),
+                                    category=item.get('category', 'OTHER'),
+                                    timestamp=default_ts,
+                                    source=f"AI-{item.get('source', 'Analysis')}",
+                                    confidence=item.get('confidence', 0.8),
+                                    affected_people=item.get('affected_people'),
+                                    damage_estimate=item.get('damage_estimate'),
+                                    coordinates=item.get('coordinates')
+                                )
+                                disasters.append(disaster)
+
+                            logger.info(f"🤖 OpenAI: Found {len(disasters)} disasters (week)")
+                            return disasters
+
+                    except ValueError as e:
+                        logger.warning(f"OpenAI JSON parsing failed: {e}")
+
         except Exception as e:
             logger.warning(f"OpenAI week search failed: {e}")
             
@@ -402,41 +586,51 @@ class DisasterSearchEngine:
         # Use only filtered feeds for 4.0+ earthquakes and 30-day coverage
         feeds_to_try = ["significant_week", "significant_month", "4.5_week", "4.5_month"]
         
+        session = await self._get_session()
+
         for feed_name in feeds_to_try:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.usgs_apis[feed_name]) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            for feature in data.get('features', []):
-                                props = feature.get('properties', {})
-                                coords = feature.get('geometry', {}).get('coordinates', [])
-                                magnitude = props.get('mag', 0)
-                                
-                                # FILTER: Only include earthquakes 4.0 and above
-                                if magnitude >= 4.0 and len(coords) >= 2:
-                                    # Clean location name
-                                    place = props.get('place', '')
-                                    location = self._clean_location(place) if place else f"Lat: {coords[1]:.2f}, Lon: {coords[0]:.2f}"
-                                    
-                                    earthquake = DisasterInfo(
-                                        id=f"usgs_{feed_name}_{props.get('ids', hashlib.md5(str(props).encode()).hexdigest()[:8])}",
-                                        title=f"Magnitude {magnitude} Earthquake",
-                                        description=props.get('title', 'Earthquake detected by USGS monitoring network'),
-                                        location=location,
-                                        severity=self._get_earthquake_severity(magnitude),
-                                        category="EARTHQUAKE",
-                                        timestamp=int(props.get('time', 0) / 1000),
-                                        source=f"USGS-{feed_name.upper()}",
-                                        confidence=0.95,
-                                        affected_people=self._estimate_affected_people(magnitude),
-                                        coordinates={"lat": coords[1], "lng": coords[0]} if len(coords) >= 2 else None
-                                    )
-                                    earthquakes.append(earthquake)
-                            
-                            logger.info(f"📊 USGS-{feed_name}: Found {len([f for f in data.get('features', []) if f.get('properties', {}).get('mag', 0) >= 4.0])} earthquakes (4.0+)")
-                            
+                feed_url = self.usgs_apis[feed_name]
+                async with session.get(feed_url, headers=self._conditional_headers(feed_url)) as response:
+                    if response.status == 304:
+                        cached = self._cached_parse(feed_url)
+                        earthquakes.extend(cached)
+                        logger.info(f"📊 USGS-{feed_name}: Not modified, reusing {len(cached)} cached earthquakes")
+                        continue
+                    if response.status == 200:
+                        data = await self._json(response)
+                        feed_quakes = []
+
+                        for feature in data.get('features', []):
+                            props = feature.get('properties', {})
+                            coords = feature.get('geometry', {}).get('coordinates', [])
+                            magnitude = props.get('mag', 0)
+
+                            # FILTER: Only include earthquakes 4.0 and above
+                            if magnitude >= 4.0 and len(coords) >= 2:
+                                # Clean location name
+                                place = props.get('place', '')
+                                location = self._clean_location(place) if place else f"Lat: {coords[1]:.2f}, Lon: {coords[0]:.2f}"
+
+                                earthquake = DisasterInfo(
+                                    id=f"usgs_{feed_name}_{props.get('ids') or _short_id((props.get('code') or props.get('title', '')).encode())}",
+                                    title=f"Magnitude {magnitude} Earthquake",
+                                    description=props.get('title', 'Earthquake detected by USGS monitoring network'),
+                                    location=location,
+                                    severity=self._get_earthquake_severity(magnitude),
+                                    category="EARTHQUAKE",
+                                    timestamp=int(props.get('time', 0) / 1000),
+                                    source=f"USGS-{feed_name.upper()}",
+                                    confidence=0.95,
+                                    affected_people=self._estimate_affected_people(magnitude),
+                                    coordinates={"lat": coords[1], "lng": coords[0]} if len(coords) >= 2 else None
+                                )
+                                feed_quakes.append(earthquake)
+
+                        self._store_http_cache(feed_url, response, feed_quakes)
+                        earthquakes.extend(feed_quakes)
+                        logger.info(f"📊 USGS-{feed_name}: Found {len(feed_quakes)} earthquakes (4.0+)")
+
             except Exception as e:
                 logger.warning(f"USGS {feed_name} search failed: {e}")
                 continue
@@ -465,70 +659,69 @@ class DisasterSearchEngine:
                 'Accept': 'application/json'
             }
             
-            timeout = aiohttp.ClientTimeout(total=30)
-            
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                logger.info(f"🌍 ReliefWeb: Requesting disasters from {cutoff_date}")
-                
-                async with session.get(self.reliefweb_api, params=params) as response:
-                    logger.info(f"🌍 ReliefWeb: Response status {response.status}")
-                    
-                    if response.status == 200:
-                        data = await response.json()
-                        disasters = []
-                        
-                        total_count = data.get('totalCount', 0)
-                        items = data.get('data', [])
-                        logger.info(f"🌍 ReliefWeb: API returned {len(items)} items (total: {total_count})")
-                        
-                        for item in items:
-                            fields = item.get('fields', {})
-                            
-                            # Extract location
-                            countries = fields.get('country', [])
-                            if countries and isinstance(countries, list):
-                                location = ', '.join([c.get('name', '') for c in countries if isinstance(c, dict)])
-                            else:
-                                location = 'Global'
-                            
-                            # Extract disaster type and map to category
-                            disaster_types = fields.get('disaster_type', [])
-                            category = self._map_reliefweb_type(disaster_types)
-                            
-                            # Parse date
-                            date_info = fields.get('date', {})
-                            if isinstance(date_info, dict):
-                                date_str = date_info.get('created', '')
-                            else:
-                                date_str = ''
-                            timestamp = self._parse_reliefweb_date(date_str)
-                            
-                            # Get title and description
-                            title = fields.get('title', 'Unknown Disaster')
-                            body = fields.get('body', '')
-                            description = self._clean_description(body) if body else 'No description available'
-                            
-                            disaster = DisasterInfo(
-                                id=f"reliefweb_{item.get('id', hashlib.md5(str(fields).encode()).hexdigest()[:8])}",
-                                title=title,
-                                description=description,
-                                location=location,
-                                severity=self._analyze_severity(description),
-                                category=category,
-                                timestamp=timestamp,
-                                source="ReliefWeb-UN",
-                                confidence=0.90,
-                                affected_people=self._estimate_people_from_text(description)
-                            )
-                            disasters.append(disaster)
-                        
-                        logger.info(f"🌍 ReliefWeb: Successfully processed {len(disasters)} disasters")
-                        return disasters
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"🌍 ReliefWeb: HTTP {response.status} - {error_text[:200]}")
-                        return []
-                        
+            session = await self._get_session()
+            logger.info(f"🌍 ReliefWeb: Requesting disasters from {cutoff_date}")
+
+            async with session.get(self.reliefweb_api, params=params, headers=headers,
+                                   timeout=_SLOW_FEED_TIMEOUT) as response:
+                logger.info(f"🌍 ReliefWeb: Response status {response.status}")
+
+                if response.status == 200:
+                    data = await self._json(response)
+                    disasters = []
+
+                    total_count = data.get('totalCount', 0)
+                    items = data.get('data', [])
+                    logger.info(f"🌍 ReliefWeb: API returned {len(items)} items (total: {total_count})")
+
+                    for item in items:
+                        fields = item.get('fields', {})
+
+                        # Extract location
+                        countries = fields.get('country', [])
+                        if countries and isinstance(countries, list):
+                            location = ', '.join([c.get('name', '') for c in countries if isinstance(c, dict)])
+                        else:
+                            location = 'Global'
+
+                        # Extract disaster type and map to category
+                        disaster_types = fields.get('disaster_type', [])
+                        category = self._map_reliefweb_type(disaster_types)
+
+                        # Parse date
+                        date_info = fields.get('date', {})
+                        if isinstance(date_info, dict):
+                            date_str = date_info.get('created', '')
+                        else:
+                            date_str = ''
+                        timestamp = self._parse_reliefweb_date(date_str)
+
+                        # Get title and description
+                        title = fields.get('title', 'Unknown Disaster')
+                        body = fields.get('body', '')
+                        description = self._clean_description(body) if body else 'No description available'
+
+                        disaster = DisasterInfo(
+                            id=f"reliefweb_{item.get('id') or _short_id(fields.get('title', '').encode())}",
+                            title=title,
+                            description=description,
+                            location=location,
+                            severity=self._analyze_severity(description),
+                            category=category,
+                            timestamp=timestamp,
+                            source="ReliefWeb-UN",
+                            confidence=0.90,
+                            affected_people=self._estimate_people_from_text(description)
+                        )
+                        disasters.append(disaster)
+
+                    logger.info(f"🌍 ReliefWeb: Successfully processed {len(disasters)} disasters")
+                    return disasters
+                else:
+                    error_text = await response.text()
+                    logger.error(f"🌍 ReliefWeb: HTTP {response.status} - {error_text[:200]}")
+                    return []
+
         except asyncio.TimeoutError:
             logger.warning("🌍 ReliefWeb: Request timeout")
             return []
@@ -544,63 +737,62 @@ class DisasterSearchEngine:
                 'Accept': 'application/rss+xml, application/xml, text/xml'
             }
             
-            timeout = aiohttp.ClientTimeout(total=30)
-            
-            # Try with SSL verification disabled for GDACS
-            connector = aiohttp.TCPConnector(ssl=False)
-            
-            async with aiohttp.ClientSession(
-                timeout=timeout, 
-                headers=headers,
-                connector=connector
-            ) as session:
-                logger.info("🚨 GDACS: Requesting global disaster alerts...")
-                
-                async with session.get(self.gdacs_api) as response:
-                    logger.info(f"🚨 GDACS: Response status {response.status}")
-                    
-                    if response.status == 200:
-                        content = await response.text()
-                        feed = feedparser.parse(content)
-                        disasters = []
-                        
-                        logger.info(f"🚨 GDACS: RSS feed parsed, found {len(feed.entries)} entries")
-                        
-                        for entry in feed.entries:
-                            # Parse GDACS specific data
-                            title = entry.title
-                            description = entry.get('summary', entry.title)
-                            
-                            # Extract severity from GDACS alert levels
-                            severity = self._parse_gdacs_severity(title, description)
-                            
-                            # Extract location from title/description
-                            location = self._extract_location_enhanced(title + " " + description)
-                            
-                            # Parse entry time
-                            entry_time = self._parse_entry_time(entry)
-                            
-                            disaster = DisasterInfo(
-                                id=f"gdacs_{hashlib.md5(entry.link.encode()).hexdigest()[:8]}",
-                                title=title,
-                                description=self._clean_description(description),
-                                location=location,
-                                severity=severity,
-                                category=self._categorize_disaster(title + " " + description),
-                                timestamp=int(entry_time.timestamp()),
-                                source="GDACS-EU",
-                                confidence=0.85,
-                                affected_people=self._estimate_people_from_text(description)
-                            )
-                            disasters.append(disaster)
-                        
-                        logger.info(f"🚨 GDACS: Successfully processed {len(disasters)} alerts")
-                        return disasters
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"🚨 GDACS: HTTP {response.status} - {error_text[:200]}")
-                        return []
-                        
+            session = await self._get_session()
+            logger.info("🚨 GDACS: Requesting global disaster alerts...")
+
+            # SSL verification disabled per-request for GDACS
+            async with session.get(self.gdacs_api,
+                                   headers=self._conditional_headers(self.gdacs_api, headers),
+                                   ssl=False, timeout=_SLOW_FEED_TIMEOUT) as response:
+                logger.info(f"🚨 GDACS: Response status {response.status}")
+
+                if response.status == 304:
+                    cached = self._cached_parse(self.gdacs_api)
+                    logger.info(f"🚨 GDACS: Not modified, reusing {len(cached)} cached alerts")
+                    return cached
+                if response.status == 200:
+                    content = await response.text()
+                    feed = await self._parse_feed_async(content)
+                    disasters = []
+
+                    logger.info(f"🚨 GDACS: RSS feed parsed, found {len(feed.entries)} entries")
+
+                    for entry in feed.entries:
+                        # Parse GDACS specific data
+                        title = entry.title
+                        description = entry.get('summary', entry.title)
+
+                        # Extract severity from GDACS alert levels
+                        severity = self._parse_gdacs_severity(title, description)
+
+                        # Extract location from title/description
+                        location = self._extract_location_enhanced(title + " " + description)
+
+                        # Parse entry time
+                        entry_time = self._parse_entry_time(entry)
+
+                        disaster = DisasterInfo(
+                            id=f"gdacs_{_short_id(entry.link.encode())}",
+                            title=title,
+                            description=self._clean_description(description),
+                            location=location,
+                            severity=severity,
+                            category=self._categorize_disaster(title + " " + description),
+                            timestamp=int(entry_time.timestamp()),
+                            source="GDACS-EU",
+                            confidence=0.85,
+                            affected_people=self._estimate_people_from_text(description)
+                        )
+                        disasters.append(disaster)
+
+                    self._store_http_cache(self.gdacs_api, response, disasters)
+                    logger.info(f"🚨 GDACS: Successfully processed {len(disasters)} alerts")
+                    return disasters
+                else:
+                    error_text = await response.text()
+                    logger.error(f"🚨 GDACS: HTTP {response.status} - {error_text[:200]}")
+                    return []
+
         except asyncio.TimeoutError:
             logger.warning("🚨 GDACS: Request timeout")
             return []
@@ -652,6 +844,7 @@ class DisasterSearchEngine:
 
     def generate_blockchain_data(self, disaster: DisasterInfo) -> Dict:
         """Generate blockchain-ready data for a single disaster"""
+        now_ts = int(datetime.now().timestamp())
         return {
             "id": disaster.id,
             "name": disaster.title,
@@ -662,8 +855,8 @@ class DisasterSearchEngine:
             "image_url": "",  # Could be enhanced later
             "external_source": disaster.source,
             "status": 0,  # Active
-            "created_at": int(datetime.now().timestamp()),
-            "updated_at": int(datetime.now().timestamp()),
+            "created_at": now_ts,
+            "updated_at": now_ts,
             "created_by": "0x0000000000000000000000000000000000000000",
             "severity": disaster.severity,
             "category": disaster.category,
@@ -704,12 +897,12 @@ class DisasterSearchEngine:
         """Enhanced location extraction from text"""
         # Try regex patterns first
         for pattern in self.location_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    return f"{matches[0][0]}, {matches[0][1]}"
-                else:
-                    return matches[0]
+            match = pattern.search(text)
+            if match:
+                groups = match.groups()
+                if len(groups) >= 2 and groups[1]:
+                    return f"{groups[0]}, {groups[1]}"
+                return groups[0]
         
         # Fallback to keyword matching
         countries = [
@@ -808,45 +1001,22 @@ class DisasterSearchEngine:
 
     def _is_disaster_news(self, text: str) -> bool:
         """Check if text is disaster-related news"""
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self.disaster_keywords)
+        return self._kw_regex.search(text) is not None
 
     def _analyze_severity(self, text: str) -> str:
         """Analyze severity from text"""
-        text_lower = text.lower()
-        
-        critical_words = ["catastrophic", "devastating", "major", "massive", "deadly", "fatal"]
-        high_words = ["severe", "significant", "serious", "dangerous", "critical"]
-        medium_words = ["moderate", "considerable", "notable"]
-        
-        if any(word in text_lower for word in critical_words):
-            return "CRITICAL"
-        elif any(word in text_lower for word in high_words):
-            return "HIGH"
-        elif any(word in text_lower for word in medium_words):
-            return "MEDIUM"
-        else:
+        matches = self._sev_re.findall(text.lower())
+        if not matches:
             return "LOW"
+        return {3: "CRITICAL", 2: "HIGH", 1: "MEDIUM"}[max(self._sev_meta[m] for m in matches)]
 
     def _categorize_disaster(self, text: str) -> str:
         """Categorize disaster from text"""
-        text_lower = text.lower()
-        
-        categories = {
-            "EARTHQUAKE": ["earthquake", "quake", "seismic", "tremor"],
-            "WILDFIRE": ["fire", "wildfire", "blaze", "burn"],
-            "FLOOD": ["flood", "flooding", "deluge", "inundation"],
-            "HURRICANE": ["hurricane", "typhoon", "cyclone", "storm"],
-            "VOLCANO": ["volcano", "volcanic", "eruption", "lava"],
-            "TORNADO": ["tornado", "twister"],
-            "DROUGHT": ["drought", "dry", "water shortage"]
-        }
-        
-        for category, keywords in categories.items():
-            if any(keyword in text_lower for keyword in keywords):
-                return category
-        
-        return "OTHER"
+        matches = self._cat_re.findall(text.lower())
+        if not matches:
+            return "OTHER"
+        category, _ = max((self._kw_meta[m] for m in set(matches)), key=lambda meta: meta[1])
+        return category
 
     def _get_earthquake_severity(self, magnitude: float) -> str:
         """Get earthquake severity from magnitude"""
@@ -5,6 +5,7 @@ Advanced filtering and validation for disaster data
 
 import re
 import logging
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
@@ -142,6 +143,11 @@ class DataQualityEnhancer:
             "New York, USA": {"lat": 40.7128, "lng": -74.0060},
         }
 
+        # The same raw location strings repeat across feeds ("Ukraine", "Gaza", ...),
+        # so memoize the per-string cleanup and lookup on this instance
+        self.clean_location = lru_cache(maxsize=4096)(self.clean_location)
+        self.get_coordinates = lru_cache(maxsize=4096)(self.get_coordinates)
+
     def is_actual_disaster(self, title: str, description: str) -> bool:
         """Check if content is actually disaster-related"""
         full_text = (title + " " + description).lower()
@@ -31,7 +31,12 @@ class HybridDisasterEngine:
         
         # 7일 최적화 설정
         self.data_range_days = 7
-        
+
+    async def close(self):
+        """공유 HTTP 세션 정리 (애플리케이션 종료 시 호출)"""
+        await self.legacy_engine.close()
+        await self.ai_agent.close()
+
     async def get_initial_disasters(self, days: int = 7) -> List[DisasterInfo]:
         """하이브리드 방식으로 7일치 재해 데이터 수집"""
         
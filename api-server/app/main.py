@@ -96,6 +96,11 @@ async def startup_event():
     
     logger.info(f"✅ Dashboard ready! Loaded {len(current_disasters)} disasters")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Application shutdown cleanup"""
+    await search_engine.close()
+
 @app.get("/")
 async def integrated_dashboard():
     """Integrated dashboard with AI Agent functionality"""